@@ -22,6 +22,9 @@ class ALAMO_PT_materialPropertyPanel(bpy.types.Panel):
                 if "None" not in bpy.data.images:
                     bpy.data.images.new(name="None", width=1, height=1)
                 col.prop(material.shaderList, "shaderList")
+                if material.get("alamoDeferred", False):
+                    col.operator("alamo.build_deferred_materials")
+                col.operator("alamo.load_textures")
                 if material.shaderList.shaderList != "alDefault.fx":
                     shader_props = settings.material_parameter_dict[
                         material.shaderList.shaderList
@@ -26,6 +26,8 @@ modules = (
     '.validation',
     '.UI',
     '.UI_material',
+    '.alo_reader',
+    '.model_cache',
     '.import_alo',
     '.import_ala',
     '.export_alo',
@@ -51,6 +53,8 @@ def reimport_modules():
 from . import validation
 from . import UI
 from . import UI_material
+from . import alo_reader
+from . import model_cache
 from . import import_alo
 from . import import_ala
 from . import export_alo
@@ -60,6 +64,9 @@ from . import utils
 
 classes = (
     import_alo.ALO_Importer,
+    import_alo.ALO_BatchImporter,
+    import_alo.ALO_BuildMaterials,
+    import_alo.ALO_LoadTextures,
     import_ala.ALA_Importer,
     export_alo.ALO_Exporter,
     export_ala.ALA_Exporter,
@@ -68,6 +75,7 @@ classes = (
 #blender registration
 def menu_func_import(self, context):
     self.layout.operator(import_alo.ALO_Importer.bl_idname, text=".ALO Importer")
+    self.layout.operator(import_alo.ALO_BatchImporter.bl_idname, text=".ALO Batch Importer")
     self.layout.operator(import_ala.ALA_Importer.bl_idname, text=".ALA Importer")
 
 
@@ -0,0 +1,456 @@
+"""Reads ALO model files into plain python and numpy data.
+
+This module doesn't depend on bpy, it can be used outside of Blender to
+inspect, profile or parse models in other processes. The Blender side of the
+import lives in import_alo, which builds objects from the returned Model.
+"""
+from dataclasses import dataclass, field
+import hashlib
+import struct
+import mmap
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# interleaved layout of the 0x10007 vertex buffer chunk, 144 bytes per vertex
+vertex_buffer_dtype = np.dtype({
+    'names': ['co', 'normal', 'uv', 'bone_index', 'bone_weight'],
+    'formats': [('<f4', 3), ('<f4', 3), ('<f4', 2), ('<u4', 4), ('<f4', 4)],
+    'offsets': [0, 12, 24, 112, 128],
+    'itemsize': 144,
+})
+
+# the legacy 0x10005 chunk lacks the 16 unused bytes in front of the bone indices
+legacy_vertex_buffer_dtype = np.dtype({
+    'names': ['co', 'normal', 'uv', 'bone_index', 'bone_weight'],
+    'formats': [('<f4', 3), ('<f4', 3), ('<f4', 2), ('<u4', 4), ('<f4', 4)],
+    'offsets': [0, 12, 24, 96, 112],
+    'itemsize': 128,
+})
+
+
+def decode_vertex_buffer(buffer, nVertices, legacy):
+    # views the whole chunk as a structured array instead of reading it vertex by vertex
+    dtype = legacy_vertex_buffer_dtype if legacy else vertex_buffer_dtype
+    vertex_data = np.frombuffer(buffer, dtype=dtype, count=nVertices)
+
+    vertices = np.ascontiguousarray(vertex_data['co'])
+    UVs = vertex_data['uv'] * np.array((1, -1), dtype=np.float32)  # second UV mirrored in alo format
+    boneIndex = vertex_data['bone_index'][:, 0].copy()
+    return vertices, UVs, boneIndex
+
+
+def decode_index_buffer(buffer, nFaces, faceOffset):
+    # triangle list of ushorts, widened so the submesh offset can't overflow
+    indices = np.frombuffer(buffer, dtype='<u2', count=nFaces * 3).astype(np.int32)
+    indices += faceOffset
+    return indices
+
+
+def read_string(string):
+    # strings are zero terminated, the exporter writes utf-8 but older tools wrote latin-1
+    string = bytes(string).split(b"\x00", 1)[0]
+    try:
+        return string.decode('utf-8')
+    except UnicodeDecodeError:
+        return string.decode('latin-1')
+
+
+uint_unpacker = struct.Struct('<I')
+float_unpacker = struct.Struct('<f')
+float3_unpacker = struct.Struct('<3f')
+float4_unpacker = struct.Struct('<4f')
+
+
+class ChunkCursor():
+    # read-only memory map of an ALO file
+    def __init__(self, path):
+        self.name = path
+        with open(path, 'rb') as mapped_file:
+            if os.fstat(mapped_file.fileno()).st_size > 0:
+                self.map = mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.map = b''  # empty files can't be mapped
+        self.data = memoryview(self.map)
+        self.size = len(self.data)
+
+    def index(self):
+        # chunk tree of the whole file, the returned root entry has the top level chunks as children
+        return ChunkEntry(None, 0, self.size, scan_chunks(self.data, 0, self.size))
+
+    def close(self):
+        self.data.release()
+        if isinstance(self.map, mmap.mmap):
+            try:
+                self.map.close()
+            except BufferError:
+                pass  # views into the map are still alive, it is closed once they are collected
+
+
+chunk_header_unpacker = struct.Struct('<II')
+bone_unpacker = struct.Struct('<3I12f')  # parent index, visible, billboard mode and 3x4 matrix
+mesh_info_unpacker = struct.Struct('<I6f4xII')  # material count, bounding box, unused, hidden, collision
+submesh_info_unpacker = struct.Struct('<II')  # vertex and face count
+
+
+class ChunkEntry():
+    def __init__(self, id, offset, size, children):
+        self.id = id  # chunk type, e.g. 0x400 for a mesh
+        self.offset = offset  # position of the chunk data, right after the 8 byte header
+        self.size = size
+        self.children = children  # None if the chunk holds data instead of chunks
+
+    def find_all(self, id=None):
+        if self.children is None:
+            return []
+        return [child for child in self.children if id is None or child.id == id]
+
+    def find(self, id):
+        for child in self.find_all(id):
+            return child
+        return None
+
+
+def scan_chunks(data, start, end):
+    # walks the chunk headers between start and end without decoding any chunk data
+    chunks = []
+    position = start
+    while position + 8 <= end:
+        id, size = chunk_header_unpacker.unpack_from(data, position)
+        offset = position + 8
+        # the high bit is set if the chunk holds chunks instead of data
+        holds_chunks = size & 0x80000000
+        size = size & 0x7FFFFFFF
+        if offset + size > end:
+            raise ValueError(f"chunk 0x{id:x} at offset {position} runs past the end of its parent, the file is damaged")
+        children = scan_chunks(data, offset, offset + size) if holds_chunks else None
+        chunks.append(ChunkEntry(id, offset, size, children))
+        position = offset + size
+    return chunks
+
+
+def scan_mini_chunks(data, start, end):
+    # mini chunks have a one byte id and a one byte size, later ids overwrite earlier ones
+    chunks = {}
+    position = start
+    while position + 2 <= end:
+        id = data[position]
+        size = data[position + 1]
+        if position + 2 + size > end:
+            raise ValueError(f"mini chunk 0x{id:x} at offset {position} runs past the end of its chunk, the file is damaged")
+        chunks[id] = data[position + 2:position + 2 + size]
+        position += 2 + size
+    return chunks
+
+
+def split_lod_name(name):
+    # LODs are named like 'Name_LOD0', the highest number is the most detailed LOD
+    if name[len(name)-4:len(name)-1] == 'LOD' and name[-1].isdigit():
+        return name[:-1], int(name[-1])
+    return None, None
+
+
+def select_meshes(names, mode='ALL', meshNames=''):
+    # indices of the meshes an import mode decodes, see ALO_Importer.importMode
+    if mode == 'SKELETON':
+        return set()
+    elif mode == 'NAMED':
+        wanted = {name.strip().lower() for name in meshNames.split(',')}
+        return {index for index, name in enumerate(names) if name.lower() in wanted}
+    elif mode == 'HIGHEST_LOD':
+        highestLODs = {}
+        for name in names:
+            lodName, lod = split_lod_name(name)
+            if lodName is not None:
+                highestLODs[lodName] = max(lod, highestLODs.get(lodName, lod))
+        selected = set()
+        for index, name in enumerate(names):
+            lodName, lod = split_lod_name(name)
+            if lodName is None or highestLODs[lodName] == lod:
+                selected.add(index)
+        return selected
+    return set(range(len(names)))
+
+
+# intermediate model representation
+
+@dataclass
+class Skeleton:
+    names: list
+    parents: np.ndarray  # bone index of the parent, the root bone points at itself
+    visible: np.ndarray
+    billboard: np.ndarray  # index into the billboard modes, see settings.billboard_array
+    matrices: np.ndarray  # (n, 4, 4) transforms relative to the parent bone
+
+
+@dataclass
+class Material:
+    shader: str
+    params: list = field(default_factory=list)  # (name, value) of the int and float parameters in file order
+    textures: list = field(default_factory=list)  # (name, texture file name) in file order
+
+
+@dataclass
+class SubMesh:
+    material: Material
+    vertices: np.ndarray  # (n, 3) float32
+    UVs: np.ndarray  # (n, 2) float32, already flipped for Blender
+    boneIndex: np.ndarray  # (n,) index into animationMapping
+    faces: np.ndarray  # flat int32 triangle list, indices into the vertices of the whole mesh
+    animationMapping: np.ndarray  # bone index for every entry of boneIndex, empty if not skinned
+
+
+@dataclass
+class Mesh:
+    name: str
+    isHidden: bool
+    collision: bool
+    subMeshes: list
+
+
+@dataclass
+class Connection:
+    objectIndex: int  # index into Model.objects
+    boneIndex: int
+
+
+@dataclass
+class Proxy:
+    name: str
+    boneIndex: int
+    isHidden: bool
+    altDecreaseStayHidden: bool
+
+
+@dataclass
+class Model:
+    path: str
+    skeleton: Skeleton = None
+    # meshes and lights in file order, connections refer to this list, lights and skipped meshes are None
+    objects: list = field(default_factory=list)
+    lightCount: int = 0
+    connections: list = field(default_factory=list)
+    proxies: list = field(default_factory=list)
+    contentHash: str = None  # hash of the file, only set when requested
+
+    @property
+    def meshes(self):
+        return [mesh for mesh in self.objects if mesh is not None]
+
+
+# chunk readers
+
+def chunk_string(data, chunk):
+    return read_string(data[chunk.offset:chunk.offset + chunk.size])
+
+
+def read_skeleton(data, chunk):
+    names = []
+    parents = []
+    visible = []
+    billboard = []
+    matrices = []
+    for boneChunk in chunk.find_all(0x202):
+        if boneChunk.children is None or len(boneChunk.children) < 2:
+            continue
+        name = chunk_string(data, boneChunk.children[0])
+        boneData = bone_unpacker.unpack_from(data, boneChunk.children[1].offset)
+        names.append(name)
+        parents.append(0 if name == 'Root' else boneData[0])
+        visible.append(boneData[1] == 1)
+        billboard.append(boneData[2])
+        matrices.append(boneData[3:15] + (0, 0, 0, 1))
+    return Skeleton(
+        names,
+        np.array(parents, dtype=np.int64),
+        np.array(visible, dtype=bool),
+        np.array(billboard, dtype=np.int64),
+        np.array(matrices, dtype=np.float32).reshape(-1, 4, 4),
+    )
+
+
+material_param_unpackers = {
+    0x10102: uint_unpacker,
+    0x10103: float_unpacker,
+    0x10104: float3_unpacker,
+    0x10106: float4_unpacker,
+}
+
+
+def read_material(data, chunk):
+    material = Material('')
+    for child in chunk.find_all():
+        if child.id == 0x10101:
+            material.shader = chunk_string(data, child)
+        elif child.id in material_param_unpackers:
+            miniChunks = scan_mini_chunks(data, child.offset, child.offset + child.size)
+            value = material_param_unpackers[child.id].unpack_from(miniChunks[2])
+            if len(value) == 1:
+                value = value[0]
+            material.params.append((read_string(miniChunks[1]), value))
+        elif child.id == 0x10105:
+            miniChunks = scan_mini_chunks(data, child.offset, child.offset + child.size)
+            material.textures.append((read_string(miniChunks[1]), read_string(miniChunks[2])))
+    return material
+
+
+def read_submesh(data, materialChunk, dataChunk, faceOffset):
+    nVertices = nFaces = 0
+    vertices = np.empty((0, 3), dtype=np.float32)
+    UVs = np.empty((0, 2), dtype=np.float32)
+    boneIndex = np.empty(0, dtype=np.uint32)
+    faces = np.empty(0, dtype=np.int32)
+    animationMapping = np.empty(0, dtype=np.uint32)
+    for child in dataChunk.find_all():
+        buffer = data[child.offset:child.offset + child.size]
+        if child.id == 0x10001:
+            nVertices, nFaces = submesh_info_unpacker.unpack_from(buffer)
+        elif child.id == 0x10004:
+            faces = decode_index_buffer(buffer, nFaces, faceOffset)
+        elif child.id == 0x10006:
+            animationMapping = np.frombuffer(buffer, dtype='<u4').astype(np.uint32)
+        elif child.id == 0x10007:
+            vertices, UVs, boneIndex = decode_vertex_buffer(buffer, nVertices, False)
+        elif child.id == 0x10005:
+            # old version of the chunk
+            vertices, UVs, boneIndex = decode_vertex_buffer(buffer, nVertices, True)
+    return SubMesh(read_material(data, materialChunk), vertices, UVs, boneIndex, faces, animationMapping)
+
+
+def submesh_vertex_count(data, dataChunk):
+    infoChunk = dataChunk.find(0x10001)
+    if infoChunk is None:
+        return 0
+    return submesh_info_unpacker.unpack_from(data, infoChunk.offset)[0]
+
+
+# submeshes with fewer vertices on average decode faster than the work can be handed to threads
+concurrent_vertex_threshold = 4096
+
+
+def decode_concurrently(data, chunk):
+    dataChunks = chunk.find_all(0x10000)
+    if len(dataChunks) < 2:
+        return False
+    nVertices = sum(submesh_vertex_count(data, dataChunk) for dataChunk in dataChunks)
+    return nVertices >= concurrent_vertex_threshold * len(dataChunks)
+
+
+def read_mesh(data, chunk, executor=None):
+    nameChunk = chunk.find(0x401)
+    name = chunk_string(data, nameChunk) if nameChunk is not None else ''
+    nMaterials, *boundingBox, isHidden, collision = mesh_info_unpacker.unpack_from(data, chunk.find(0x402).offset)
+
+    # every submesh is a material chunk followed by its data chunk
+    pairs = list(zip(chunk.find_all(0x10100)[:nMaterials], chunk.find_all(0x10000)))
+    # face indices are offset by the vertices of the previous submeshes, the counts are read up front
+    # so the submeshes can be decoded independently
+    arguments = []
+    faceOffset = 0
+    for materialChunk, dataChunk in pairs:
+        arguments.append((data, materialChunk, dataChunk, faceOffset))
+        faceOffset += submesh_vertex_count(data, dataChunk)
+
+    if executor is None or len(pairs) < 2:
+        subMeshes = [read_submesh(*args) for args in arguments]
+    else:
+        # only the numpy copies of the vertex and index buffers can overlap, material chunks are plain python
+        # map keeps the submesh order
+        subMeshes = list(executor.map(lambda args: read_submesh(*args), arguments))
+    return Mesh(name, isHidden == 1, collision == 1, subMeshes)
+
+
+def read_connections(data, chunk, model):
+    for child in chunk.find_all():
+        miniChunks = scan_mini_chunks(data, child.offset, child.offset + child.size)
+        if child.id == 0x602:
+            model.connections.append(Connection(
+                uint_unpacker.unpack_from(miniChunks[2])[0],
+                uint_unpacker.unpack_from(miniChunks[3])[0]))
+        elif child.id == 0x603:
+            model.proxies.append(Proxy(
+                read_string(miniChunks[5]),
+                uint_unpacker.unpack_from(miniChunks[6])[0],
+                7 in miniChunks and uint_unpacker.unpack_from(miniChunks[7])[0] == 1,
+                8 in miniChunks and uint_unpacker.unpack_from(miniChunks[8])[0] == 1))
+
+
+class ALOReader():
+    # reads the chunk index once, meshes can then be listed by name before any of them is decoded
+    def __init__(self, path):
+        self.path = path
+        self.cursor = ChunkCursor(path)
+        try:
+            self.root = self.cursor.index()
+        except ValueError:
+            self.cursor.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def mesh_names(self):
+        names = []
+        for chunk in self.root.find_all(0x400):
+            nameChunk = chunk.find(0x401)
+            names.append(chunk_string(self.cursor.data, nameChunk) if nameChunk is not None else '')
+        return names
+
+    def read(self, selected=None, threads=True):
+        # selected holds the indices of the meshes to decode, all meshes are decoded if it is None
+        # threads decodes the submeshes of large meshes concurrently, processes that already run in
+        # parallel turn it off
+        data = self.cursor.data
+        model = Model(self.path)
+        meshIndex = 0
+        executor = None
+        try:
+            for chunk in self.root.find_all():
+                if chunk.id == 0x200:
+                    model.skeleton = read_skeleton(data, chunk)
+                elif chunk.id == 0x400:
+                    if selected is None or meshIndex in selected:
+                        meshExecutor = None
+                        if threads and decode_concurrently(data, chunk):
+                            if executor is None:
+                                executor = ThreadPoolExecutor()
+                            meshExecutor = executor
+                        model.objects.append(read_mesh(data, chunk, meshExecutor))
+                    else:
+                        model.objects.append(None)  # skipped meshes keep their place for connections
+                    meshIndex += 1
+                elif chunk.id == 0x1300:
+                    model.objects.append(None)  # connections count lights as objects
+                    model.lightCount += 1
+                elif chunk.id == 0x600:
+                    read_connections(data, chunk, model)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return model
+
+    def close(self):
+        self.cursor.close()
+
+
+def file_hash(path):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_model(path, mode='ALL', meshNames='', threads=True, hashContent=False):
+    with ALOReader(path) as reader:
+        selected = None
+        if mode != 'ALL':
+            selected = select_meshes(reader.mesh_names(), mode, meshNames)
+        model = reader.read(selected, threads)
+    # hashed where the file is parsed, which is off the main thread for the modal and batch imports
+    if hashContent:
+        model.contentHash = file_hash(path)
+    return model
@@ -157,16 +157,8 @@ def read_animation_information(data):
     data.scale_block_size = utils.read_int(file.read(4))
 
 def read_bone_name(data):
-    bytes = file.read(1) + bytearray(3)
-    length = struct.unpack("<I", bytes)[0]  # get string length
-    boneName = ""
-    counter = 0
-    while counter < length - 1:
-        letter = str(file.read(1))
-        letter = letter[2:len(letter) - 1]
-        boneName += letter
-        counter += 1
-    file.seek(1, 1)  # skip end byte of name
+    length = file.read(1)[0]  # get string length
+    boneName = utils.read_string(file.read(length))
     if boneName in data.visibilityDict:
         boneName += ".001"
         counter = 2
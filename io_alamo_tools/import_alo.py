@@ -1,5 +1,5 @@
 import bpy
-from . import settings, utils, import_ala
+from . import settings, utils, import_ala, alo_reader, model_cache
 
 from bpy.props import (StringProperty,
                        BoolProperty,
@@ -7,6 +7,7 @@ from bpy.props import (StringProperty,
                        FloatProperty,
                        EnumProperty,
                        PointerProperty,
+                       CollectionProperty,
                        )
 from bpy.types import (Panel,
                        Operator,
@@ -23,6 +24,450 @@ import sys
 import os
 from os import listdir
 import bmesh
+import numpy as np
+import importlib
+import importlib.util
+import multiprocessing
+import site
+import json
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+# directory listings are kept for the whole session and refreshed when the directory changes
+texture_directory_cache = {}
+
+
+def index_directory(directory):
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return {}
+    cached = texture_directory_cache.get(directory)
+    if cached != None and cached[0] == mtime:
+        return cached[1]
+    entries = {}
+    try:
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                entries[entry.name.lower()] = entry.name
+    except OSError:
+        return {}
+    texture_directory_cache[directory] = (mtime, entries)
+    return entries
+
+
+def submod_path(path, submod):
+    # swap the mod folder in front of \Data for the submod, or insert the submod if it isn't in the path
+    submodEnd = path.find("\\Data")
+    submodStart = path.find(submod)
+    if submodStart == -1:
+        submodStart = submodEnd + 1
+    return path[:submodStart] + submod + path[submodEnd:]
+
+
+class TextureResolver():
+    # resolves texture names case-insensitively against the TEXTURES folder next to a model,
+    # every directory is checked at most once per import
+    def __init__(self, modelPath, submod="NONE"):
+        self.directories = {}
+        self.submod = submod
+        self.artPath = os.path.split(os.path.split(modelPath)[0])[0]
+        self.textureDirectory = None
+        textureDirectoryName = self.listing(self.artPath).get('textures')
+        if textureDirectoryName != None:
+            self.textureDirectory = f'{self.artPath}/{textureDirectoryName}'
+        self.submodDirectory = None
+        if self.textureDirectory != None and submod != "NONE":
+            self.submodDirectory = submod_path(self.textureDirectory, submod)
+
+    def listing(self, directory):
+        if directory not in self.directories:
+            self.directories[directory] = index_directory(directory)
+        return self.directories[directory]
+
+    def find(self, directory, texture_name):
+        fileName = self.listing(directory).get(texture_name.lower())
+        if fileName == None:
+            return None
+        return f'{directory}/{fileName}'
+
+
+# material schema, built once from settings
+# shader names by lowercase name, files don't always match the case of the shader
+shader_index = {shader.lower(): shader for shader in settings.material_parameter_dict}
+# registered in UI_material without being listed for a shader, older files still carry them
+legacy_material_props = ('DiffuseColor',)
+# every parameter used by any shader, sorted so material keys stay stable
+material_props = tuple(sorted({param for params in settings.material_parameter_dict.values() for param in params if param != ""}
+                              | set(legacy_material_props)))
+
+
+def material_setter(name):
+    def set_value(material, value):
+        setattr(material, name, value)
+    return set_value
+
+
+material_setters = {name: material_setter(name) for name in material_props}
+
+
+def material_content_key(shader, params):
+    # shader and every parameter of a material, materials with the same key look the same
+    return repr((shader, tuple(sorted(params.items()))))
+
+
+def material_matches(material, shader, params):
+    # the stored key only describes a material as long as nobody edited it after the import
+    if material.shaderList.shaderList != shader:
+        return False
+    for name, value in params.items():
+        current = getattr(material, name)
+        if isinstance(value, str):
+            if current != value:
+                return False
+            continue
+        # float vector properties come back as float32, clamped to the limits of the property
+        current = np.asarray(current, dtype=np.float64).ravel()
+        value = np.asarray(value, dtype=np.float64).ravel()
+        rnaProperty = material.bl_rna.properties[name]
+        value = np.clip(value, rnaProperty.hard_min, rnaProperty.hard_max)
+        if current.shape != value.shape or not np.allclose(current, value, rtol=1e-5, atol=1e-6):
+            return False
+    return True
+
+
+def mesh_fingerprint(mesh):
+    # vertex and polygon count and bounding box, cheap enough to check every mesh an import reuses
+    coordinates = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coordinates)
+    coordinates = coordinates.reshape(-1, 3)
+    if len(coordinates) == 0:
+        bounds = [0.0] * 6
+    else:
+        bounds = [*coordinates.min(axis=0).tolist(), *coordinates.max(axis=0).tolist()]
+    return [float(len(mesh.vertices)), float(len(mesh.polygons)), *bounds]
+
+
+def mesh_matches(mesh):
+    # like material_matches, the stored key only holds while the geometry wasn't edited
+    fingerprint = mesh.get('alamoMeshFingerprint')
+    if fingerprint == None:
+        return False
+    return np.allclose(mesh_fingerprint(mesh), list(fingerprint), rtol=1e-6, atol=1e-6)
+
+
+def index_by_key(collection, keyName):
+    # maps the key stored in a custom property to its datablock, used to reuse datablocks across imports
+    return {item[keyName]: item for item in collection if keyName in item}
+
+
+# shadow and collision meshes are hidden and get their split vertices welded on import
+shadow_collision_shaders = {'MeshCollision.fx', 'RSkinShadowVolume.fx', 'MeshShadowVolume.fx'}
+
+
+def weld_mesh(mesh, distance=0.0001):
+    # same result as mesh.remove_doubles on everything, without entering edit mode
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=distance)
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+
+
+def read_file(path):
+    # the bytes are dropped, reading the file only puts it in the OS cache for Blender
+    try:
+        with open(path, 'rb') as file:
+            return len(file.read())
+    except OSError:
+        return 0
+
+
+def load_image(texture_name, textureResolver, report, prefetch=None):
+    if texture_name == 'None':
+        return
+    elif (texture_name in bpy.data.images):
+        img = bpy.data.images[texture_name]
+    elif textureResolver.textureDirectory == None:
+        report({"WARNING"}, "ALAMO - Couldn't find: " + textureResolver.artPath)
+    else:
+        path = None
+        if textureResolver.submodDirectory != None:
+            path = textureResolver.find(textureResolver.submodDirectory, texture_name)
+            if path == None:
+                report({"WARNING"}, f'ALAMO - {texture_name} not found in {textureResolver.submod}, falling back to default')
+        if path == None:
+            path = textureResolver.find(textureResolver.textureDirectory, texture_name)
+        if path != None:
+            # only the path is set, Blender reads the pixels when the image is first displayed
+            img = bpy.data.images.new(texture_name, 1, 1)
+            img.source = 'FILE'
+            img.filepath = path
+            if prefetch != None:
+                prefetch.submit(read_file, path)
+        else:
+            # placeholder that keeps the expected path, so the texture shows up once it exists
+            img = bpy.data.images.new(texture_name, 1, 1)
+            img.source = 'FILE'
+            img.filepath = f'{textureResolver.textureDirectory}/{texture_name}'
+            report({"WARNING"}, "ALAMO - Couldn't find texture: " + texture_name)
+
+
+def load_textures(images, prefetch=True):
+    # reads the files of the given images in parallel and reloads them, so their pixels are decoded again
+    paths = [bpy.path.abspath(image.filepath) for image in images if image.source == 'FILE']
+    if prefetch:
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(read_file, paths))
+    for image in images:
+        if image.source == 'FILE':
+            image.reload()
+
+
+def material_group_additive(group_name, material, is_emissive):
+    node_group = bpy.data.node_groups.new(group_name, 'ShaderNodeTree')
+
+    node = node_group.nodes.new
+    link = node_group.links.new
+
+    group_out = node('NodeGroupOutput')
+    group_out.location.x += 200.0
+    node_group.interface.new_socket(socket_type='NodeSocketShader', name='Surface', in_out='OUTPUT')
+
+    mix_shader = node("ShaderNodeMixShader")
+
+    transparent = node("ShaderNodeBsdfTransparent")
+    transparent.location.x -= 200
+    transparent.location.y -= 50
+
+    base_image_node = node("ShaderNodeTexImage")
+    base_image_node.location.x -= 500
+
+    if is_emissive:
+        group_in = node('NodeGroupInput')
+        group_in.location.x -= 700
+        emissive = node_group.interface.new_socket(socket_type='NodeSocketFloat',
+                                                   name='Emissive Strength',
+                                                   in_out='INPUT')
+        emissive.default_value = 100.0
+        color = node("ShaderNodeEmission")
+        link(group_in.outputs[0], color.inputs[1])
+        eevee_alpha_fix = node("ShaderNodeInvert")
+        eevee_alpha_fix.location.x -= 500
+        eevee_alpha_fix.location.y += 300
+        # Fix for obnoxious transparency bug in Eevee
+        link(base_image_node.outputs[1], eevee_alpha_fix.inputs[1])
+        link(base_image_node.outputs['Color'],
+             mix_shader.inputs['Fac'])
+
+    else:
+        color = node("ShaderNodeBsdfDiffuse")
+        link(base_image_node.outputs['Alpha'],
+             mix_shader.inputs['Fac'])
+
+    color.location.x -= 200
+    color.location.y -= 150
+
+    link(base_image_node.outputs['Color'], color.inputs[0])
+    link(transparent.outputs[0], mix_shader.inputs[1])
+    link(color.outputs[0], mix_shader.inputs[2])
+
+    if material.BaseTexture != 'None' and material.BaseTexture in bpy.data.images:
+        diffuse_texture = bpy.data.images[material.BaseTexture]
+        diffuse_texture.alpha_mode = 'CHANNEL_PACKED'
+        base_image_node.image = diffuse_texture
+
+    link(mix_shader.outputs[0], group_out.inputs[0])
+
+    return node_group
+
+
+def material_group_basic(group_name, material):
+    node_group = bpy.data.node_groups.new(group_name, 'ShaderNodeTree')
+
+    node = node_group.nodes.new
+    link = node_group.links.new
+
+    group_in = node('NodeGroupInput')
+    group_in.location.x -= 700
+    node_group.interface.new_socket(socket_type='NodeSocketColor',
+                                    name='Team Color',
+                                    in_out='INPUT')
+    spec = node_group.interface.new_socket(socket_type='NodeSocketFloat',
+                                           name='Specular Intensity',
+                                           in_out='INPUT')
+    spec.default_value = 0.1
+
+    group_out = node('NodeGroupOutput')
+    node_group.interface.new_socket(socket_type='NodeSocketColor',
+                                    name='Base Color',
+                                    in_out='OUTPUT')
+    node_group.interface.new_socket(socket_type='NodeSocketFloat',
+                                    name='Specular',
+                                    in_out='OUTPUT')
+    node_group.interface.new_socket(socket_type='NodeSocketVector',
+                                    name='Normal',
+                                    in_out='OUTPUT')
+
+    base_image_node = node("ShaderNodeTexImage")
+    base_image_node.location.x -= 500
+
+    mix_node = node("ShaderNodeMixRGB")
+    mix_node.blend_type = 'COLOR'
+    mix_node.location.x -= 200
+
+    link(base_image_node.outputs['Color'], mix_node.inputs['Color1'])
+    link(base_image_node.outputs['Alpha'], mix_node.inputs['Fac'])
+    link(mix_node.outputs['Color'], group_out.inputs['Base Color'])
+
+    normal_image_node = node("ShaderNodeTexImage")
+    normal_image_node.location.x -= 1100.0
+    normal_image_node.location.y -= 300.0
+
+    normal_split = node("ShaderNodeSeparateRGB")
+    normal_split.location.x -= 800
+    normal_split.location.y -= 300
+    normal_invert = node("ShaderNodeMath")
+    normal_invert.operation = 'SUBTRACT'
+    normal_invert.inputs[0].default_value = 1
+    normal_invert.location.x -= 600
+    normal_invert.location.y -= 300
+    normal_combine = node("ShaderNodeCombineRGB")
+    normal_combine.location.x -= 400
+    normal_combine.location.y -= 300
+
+    normal_map_node = node("ShaderNodeNormalMap")
+    normal_map_node.space = 'TANGENT'
+    normal_map_node.location.x -= 200.0
+    normal_map_node.location.y -= 300.0
+
+    specular_multiply = node("ShaderNodeMath")
+    specular_multiply.operation = 'MULTIPLY'
+    specular_multiply.location.x -= 800
+    specular_multiply.location.y -= 100
+
+    link(normal_image_node.outputs['Color'],
+         normal_split.inputs['Image'])
+    link(normal_split.outputs['R'], normal_combine.inputs['R'])
+    link(normal_split.outputs['G'], normal_invert.inputs[1])
+    link(normal_invert.outputs[0], normal_combine.inputs['G'])
+    link(normal_split.outputs['B'], normal_combine.inputs['B'])
+    link(normal_combine.outputs[0], normal_map_node.inputs[1])
+    link(normal_map_node.outputs[0], group_out.inputs[2])
+
+    link(normal_image_node.outputs['Alpha'],
+         specular_multiply.inputs[0])
+
+    link(group_in.outputs['Team Color'], mix_node.inputs['Color2'])
+    link(group_in.outputs['Specular Intensity'],
+         specular_multiply.inputs[1])
+    link(specular_multiply.outputs[0], group_out.inputs[1])
+
+    if material.BaseTexture != 'None' and material.BaseTexture in bpy.data.images:
+        diffuse_texture = bpy.data.images[material.BaseTexture]
+        diffuse_texture.alpha_mode = 'CHANNEL_PACKED'
+        base_image_node.image = diffuse_texture
+
+    if material.NormalTexture != 'None' and material.NormalTexture in bpy.data.images:
+        normal_texture = bpy.data.images[material.NormalTexture]
+        normal_texture.alpha_mode = 'CHANNEL_PACKED'
+        normal_image_node.image = normal_texture
+        normal_image_node.image.colorspace_settings.name = 'Non-Color'
+
+    return node_group
+
+
+def shared_node_group(groupKey, group_name, build, nodeGroupsByKey):
+    # node groups only depend on the shader type and the textures, so they are shared between materials
+    node_group = nodeGroupsByKey.get(groupKey)
+    if node_group == None:
+        node_group = build(group_name)
+        node_group['alamoGroupKey'] = groupKey
+        nodeGroupsByKey[groupKey] = node_group
+    return node_group
+
+
+def set_up_textures(material, nodeGroupsByKey):
+    material.use_nodes = True
+    nt = material.node_tree
+    nodes = nt.nodes
+    links = nt.links
+
+    # clean up
+    while(nodes):
+        nodes.remove(nodes[0])
+
+    output = nodes.new("ShaderNodeOutputMaterial")
+    custom_node_name = material.name + "Group"
+    my_group = 'null'
+
+    if ("Additive" in material.shaderList.shaderList):
+        material.blend_method = "BLEND"
+        my_group = shared_node_group(
+            f'Additive|{material.BaseTexture}', custom_node_name,
+            lambda name: material_group_additive(name, material, True),
+            nodeGroupsByKey)
+        mat_group = nt.nodes.new("ShaderNodeGroup")
+        mat_group.node_tree = my_group
+        mat_group.location.x -= 200.0
+        links.new(mat_group.outputs[0], output.inputs['Surface'])
+    elif ("Alpha" in material.shaderList.shaderList):
+        material.blend_method = "BLEND"
+        my_group = shared_node_group(
+            f'Alpha|{material.BaseTexture}', custom_node_name,
+            lambda name: material_group_additive(name, material, False),
+            nodeGroupsByKey)
+        mat_group = nt.nodes.new("ShaderNodeGroup")
+        mat_group.node_tree = my_group
+        mat_group.location.x -= 200.0
+        links.new(mat_group.outputs[0], output.inputs['Surface'])
+    else:
+        bsdf = nodes.new("ShaderNodeBsdfPrincipled")
+        bsdf.inputs['Metallic'].default_value = 0.1
+        bsdf.inputs['Roughness'].default_value = 0.2
+        bsdf.location.x -= 300.0
+        links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
+        my_group = shared_node_group(
+            f'Basic|{material.BaseTexture}|{material.NormalTexture}', custom_node_name,
+            lambda name: material_group_basic(name, material),
+            nodeGroupsByKey)
+        mat_group = nt.nodes.new("ShaderNodeGroup")
+        mat_group.node_tree = my_group
+        mat_group.location.x -= 500.0
+        links.new(mat_group.outputs[0], bsdf.inputs['Base Color'])
+        links.new(mat_group.outputs[1], bsdf.inputs[5])
+        links.new(mat_group.outputs[2], bsdf.inputs['Normal'])
+
+
+def set_up_flat_material(material):
+    # viewport colour only, the node tree is built later by ALO_BuildMaterials
+    material.use_nodes = False
+    if 'Diffuse' in material:
+        color = material.Diffuse
+        material.diffuse_color = (color[0], color[1], color[2], 1.0)
+    material['alamoDeferred'] = True
+
+
+def build_deferred_materials(materials, report, prefetch=None):
+    # loads the textures and builds the node trees of materials imported in deferred mode
+    textureResolvers = {}
+    nodeGroupsByKey = index_by_key(bpy.data.node_groups, 'alamoGroupKey')
+    built = 0
+    for material in materials:
+        if not material.get('alamoDeferred', False):
+            continue
+        resolverKey = (material['alamoModelPath'], material['alamoTextureOverride'])
+        if resolverKey not in textureResolvers:
+            textureResolvers[resolverKey] = TextureResolver(*resolverKey)
+        for prop in material_props:
+            if prop.endswith('Texture') and prop in material:
+                load_image(material[prop], textureResolvers[resolverKey], report, prefetch)
+        set_up_textures(material, nodeGroupsByKey)
+        del material['alamoDeferred']
+        built += 1
+    return built
 
 
 def boneEnumCallback(scene, context):
@@ -37,6 +482,587 @@ def boneEnumCallback(scene, context):
     return bones
 
 
+def cut_string(string):
+    # bones have a 63 character limit, this function cuts longer strings with space for .xyz end used by blender to distinguish double name
+    if(len(string) > 63):
+        return string[0:59]
+    else:
+        return string
+
+
+class PhaseTimer():
+    # seconds spent in each phase of an import, a nested phase pauses the phase it was entered from
+    def __init__(self):
+        self.phases = {}
+        self.stack = []
+        self.start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        now = time.perf_counter()
+        if self.stack:
+            outer = self.stack[-1]
+            self.phases[outer[0]] = self.phases.get(outer[0], 0.0) + now - outer[1]
+        self.stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            name, started = self.stack.pop()
+            self.phases[name] = self.phases.get(name, 0.0) + now - started
+            if self.stack:
+                self.stack[-1][1] = now
+
+    def record(self, name, seconds):
+        # for work that wasn't timed by a phase, like parsing on another thread
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def total(self):
+        return time.perf_counter() - self.start
+
+    def summary(self):
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items())
+        return f"{self.total():.2f}s ({phases})"
+
+
+def write_timing_log(logPath, modelPath, timer):
+    # one json record per line, so the log of many imports can be appended to and compared
+    record = {
+        'model': modelPath,
+        'date': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'total': round(timer.total(), 4),
+        'phases': {name: round(seconds, 4) for name, seconds in timer.phases.items()},
+    }
+    with open(bpy.path.abspath(logPath), 'a') as file:
+        file.write(json.dumps(record) + "\n")
+
+
+class ModelBuilder():
+    # creates the Blender objects for a model read by alo_reader, everything one import needs is kept here
+    def __init__(self, collection, report, materialMode='FULL', textureOverride='NONE', prefetch=None,
+                 modelHash=None, reuseMeshes=False, timer=None):
+        self.collection = collection
+        self.report = report
+        self.materialMode = materialMode
+        self.textureOverride = textureOverride
+        self.prefetch = prefetch
+        self.textureResolver = None
+        self.armatureObject = None
+        self.materialsByKey = index_by_key(bpy.data.materials, 'alamoContentKey')
+        self.nodeGroupsByKey = index_by_key(bpy.data.node_groups, 'alamoGroupKey')
+        # meshes are tagged with the hash of their file, identical files can share them
+        self.modelHash = modelHash
+        # duplicating a mesh copies its key, so a key can belong to several meshes
+        self.meshesByKey = {}
+        if reuseMeshes:
+            for mesh in bpy.data.meshes:
+                if 'alamoMeshKey' in mesh:
+                    self.meshesByKey.setdefault(mesh['alamoMeshKey'], []).append(mesh)
+        self.timer = timer if timer != None else PhaseTimer()
+
+    def build(self, model):
+        for progress in self.build_steps(model):
+            pass
+        return self.objects
+
+    def build_steps(self, model):
+        # yields (built, total) after every object of the model, so an import can be spread over several calls
+        self.modelPath = model.path
+        self.modelName = os.path.basename(model.path)[0:-4]
+        self.textureResolver = TextureResolver(model.path, self.textureOverride)
+
+        if model.lightCount > 0:
+            self.report({"WARNING"}, "ALAMO - File contains light objects, these are not supported and might cause minor issues")
+
+        if model.skeleton is not None:
+            with self.timer.phase("skeleton"):
+                self.build_armature(model.skeleton)
+        else:
+            self.armatureObject = utils.findArmature()
+
+        self.objects = objects = []
+        windowManager = bpy.context.window_manager
+        windowManager.progress_begin(0, len(model.objects))
+        try:
+            for index, meshData in enumerate(model.objects):
+                if meshData is None:
+                    objects.append(None)
+                else:
+                    with self.timer.phase("mesh build"):
+                        objects.append(self.build_mesh(meshData, index))
+                windowManager.progress_update(index + 1)
+                yield index + 1, len(model.objects)
+        finally:
+            windowManager.progress_end()
+
+        # proxies and connections are applied once all objects exist
+        with self.timer.phase("post-processing"):
+            self.apply_proxies(model.proxies)
+            self.apply_connections(model.connections, objects)
+            self.hide_objects(model.objects, objects)
+            self.delete_root()
+
+    # armature and bones
+
+    def build_armature(self, skeleton):
+        # create armature
+        armatureBlender = bpy.data.armatures.new(self.modelName + "Armature")
+
+        # create object
+        armatureObj = bpy.data.objects.new(
+            self.modelName + "Rig", object_data=armatureBlender)
+        self.armatureObject = armatureObj
+
+        # Link object to collection
+        self.collection.objects.link(armatureObj)
+        bpy.context.view_layer.objects.active = armatureObj
+        bpy.context.view_layer.update()
+
+        # adjust settings and enter edit-mode
+        armatureObj.show_in_front = True
+        utils.setModeToEdit()
+
+        armatureBlender.display_type = 'STICK'
+
+        # all bones are created in this edit mode session, parents are looked up by index
+        editBones = []
+        for index in range(len(skeleton.names)):
+            editBones.append(self.build_bone(skeleton, index, armatureBlender, editBones))
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        bpy.context.scene.ActiveSkeleton.skeletonEnum = armatureObj.name
+
+    def build_bone(self, skeleton, index, armatureBlender, editBones):
+        billboardModeArray = ["Disable", "Parallel", "Face", "ZAxis View",
+                              "ZAxis Light", "ZAxis Wind", "Sunlight Glow", "Sun"]
+
+        bone = armatureBlender.edit_bones.new(cut_string(skeleton.names[index]))
+        bone.tail = mathutils.Vector([0, 1, 0])
+
+        bone.Visible = bool(skeleton.visible[index])
+
+        parentIndex = skeleton.parents[index]
+        if(skeleton.names[parentIndex] != 'Root'):
+            bone.parent = editBones[parentIndex]
+            bone.matrix = bone.parent.matrix @ mathutils.Matrix(
+                skeleton.matrices[index])
+        else:
+            bone.matrix = mathutils.Matrix(skeleton.matrices[index])
+
+        bone.billboardMode.billboardMode = billboardModeArray[skeleton.billboard[index]]
+
+        return bone
+
+    # mesh and material
+
+    def build_mesh(self, meshData, objectIndex):
+        meshKey = None
+        if self.modelHash != None:
+            meshKey = self.modelHash + ':' + str(objectIndex)
+        for sharedMesh in self.meshesByKey.get(meshKey, []):
+            if mesh_matches(sharedMesh):
+                return self.link_mesh(sharedMesh, meshData)
+
+        mesh = bpy.data.meshes.new(cut_string(meshData.name))
+        object = bpy.data.objects.new(mesh.name, mesh)
+
+        # Link object to collection
+        self.collection.objects.link(object)
+        object.show_transparent = True
+
+        if meshData.isHidden:
+            object.Hidden = True
+
+        if meshData.collision:
+            object.HasCollision = True
+
+        with self.timer.phase("materials"):
+            for subMesh in meshData.subMeshes:
+                mesh.materials.append(self.build_material(subMesh.material))
+
+        self.construct_mesh(mesh, meshData)
+        with self.timer.phase("vertex groups"):
+            self.assign_vertex_groups(object, meshData)
+
+        if len(mesh.materials) > 0 and mesh.materials[0].shaderList.shaderList in shadow_collision_shaders:
+            with self.timer.phase("post-processing"):
+                weld_mesh(mesh)
+        if meshKey != None:
+            mesh['alamoMeshKey'] = meshKey
+            mesh['alamoMeshFingerprint'] = mesh_fingerprint(mesh)
+        return object
+
+    def link_mesh(self, mesh, meshData):
+        # linked duplicate of an earlier import, geometry, weights and materials stay in the shared mesh
+        object = bpy.data.objects.new(mesh.name, mesh)
+        self.collection.objects.link(object)
+        object.show_transparent = True
+
+        if meshData.isHidden:
+            object.Hidden = True
+
+        if meshData.collision:
+            object.HasCollision = True
+
+        # vertex group names and weights live in the mesh since Blender 3.0, only the modifier is per object
+        if self.is_skinned(meshData):
+            self.add_armature_modifier(object)
+        return object
+
+    def construct_mesh(self, mesh, meshData):
+        subMeshes = meshData.subMeshes
+        vertices = np.concatenate([subMesh.vertices for subMesh in subMeshes] or [np.empty((0, 3), dtype=np.float32)])
+        faces = np.concatenate([subMesh.faces for subMesh in subMeshes] or [np.empty(0, dtype=np.int32)])
+        UVs = np.concatenate([subMesh.UVs for subMesh in subMeshes] or [np.empty((0, 2), dtype=np.float32)])
+
+        nLoops = len(faces)
+        nPolygons = nLoops // 3
+
+        mesh.vertices.add(len(vertices))
+        mesh.vertices.foreach_set("co", vertices.ravel())
+        mesh.loops.add(nLoops)
+        mesh.loops.foreach_set("vertex_index", faces)
+        mesh.polygons.add(nPolygons)
+        mesh.polygons.foreach_set("loop_start", np.arange(0, nLoops, 3, dtype=np.int32))
+        # newer Blender versions derive the polygon size from loop_start
+        if not mesh.polygons.bl_rna.properties["loop_total"].is_readonly:
+            mesh.polygons.foreach_set("loop_total", np.full(nPolygons, 3, dtype=np.int32))
+        mesh.polygons.foreach_set("use_smooth", np.ones(nPolygons, dtype=bool))
+
+        # assign materials correctly, submesh faces are stored one after another
+        subMeshFaceCounts = [len(subMesh.faces) // 3 for subMesh in subMeshes]
+        mesh.polygons.foreach_set("material_index", np.repeat(
+            np.arange(len(subMeshFaceCounts), dtype=np.int32), subMeshFaceCounts))
+
+        # Update mesh with new data
+        mesh.update(calc_edges=True)
+
+        # create UVs
+        self.create_uv_layer(mesh, "UVMap", UVs)
+
+    def create_uv_layer(self, mesh, layerName, uv_coordinates):
+        # UVs are stored per vertex, Blender stores them per loop
+        loop_vertex_indices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertex_indices)
+        uv_layer = mesh.uv_layers.new(name=layerName)
+        uv_layer.data.foreach_set(
+            "uv", uv_coordinates.take(loop_vertex_indices, axis=0).ravel())
+
+    def is_skinned(self, meshData):
+        return any(len(subMesh.animationMapping) != 0 for subMesh in meshData.subMeshes)
+
+    def add_armature_modifier(self, object):
+        mod = object.modifiers.new('MyRigModif', 'ARMATURE')
+        mod.object = self.armatureObject
+        mod.use_bone_envelopes = False
+        mod.use_vertex_groups = True
+
+    def assign_vertex_groups(self, object, meshData):
+        armatureObject = self.armatureObject
+
+        if not self.is_skinned(meshData):
+            return
+
+        self.add_armature_modifier(object)
+
+        # bone indices of a submesh point into that submesh's animation mapping
+        mapped_bones = []
+        for subMesh in meshData.subMeshes:
+            if len(subMesh.animationMapping) != 0:
+                animation_mapping = subMesh.animationMapping.astype(np.int64)
+                mapped_bones.append(animation_mapping[subMesh.boneIndex])
+            else:
+                mapped_bones.append(np.full(len(subMesh.vertices), -1, dtype=np.int64))
+
+        # bucket vertices by bone, so every group is filled with a single add()
+        mapped_bones = np.concatenate(mapped_bones)
+        order = np.argsort(mapped_bones, kind='stable')
+        bone_indices, group_starts = np.unique(mapped_bones[order], return_index=True)
+        for bone_index, vertices in zip(bone_indices, np.split(order, group_starts[1:])):
+            if bone_index < 0:
+                continue  # vertices of unskinned submeshes
+            bone = armatureObject.data.bones[int(bone_index)]
+            object.vertex_groups.new(name=bone.name).add(vertices.tolist(), 1, 'ADD')
+
+    def build_material(self, materialData):
+        # find shader, ignoring case
+        shader = shader_index.get(materialData.shader.lower())
+        if shader is None:
+            self.report({"WARNING"}, "ALAMO - Unknown shader: " + materialData.shader +
+                        " setting shader to alDefault.fx")
+            shader = "alDefault.fx"
+
+        params = {}
+        for name, value in materialData.params:
+            if name not in material_setters:
+                self.report({"WARNING"}, "ALAMO - Unknown material porperty: " + name)
+                continue
+            params[name] = value
+
+        for name, texture_name in materialData.textures:
+            # replace texture format with .dds
+            if texture_name != "None":
+                texture_name = texture_name[0:len(texture_name) - 4] + ".dds"
+            if name not in material_setters:
+                self.report({"WARNING"}, "ALAMO - Unknown material porperty: " + name)
+                continue
+            if self.materialMode == 'FULL':
+                with self.timer.phase("textures"):
+                    load_image(texture_name, self.textureResolver, self.report, self.prefetch)
+            params[name] = texture_name
+
+        # reuse a material with the same shader and parameters, also from earlier imports
+        key = material_content_key(shader, params)
+        mat = self.materialsByKey.get(key)
+        if mat != None and not material_matches(mat, shader, params):
+            # edited since it was imported, it keeps the edits but is no longer reused
+            del mat['alamoContentKey']
+            del self.materialsByKey[key]
+            mat = None
+        if mat == None:
+            if materialData.shader == 'MeshCollision.fx':
+                name = "COLLISION"
+            elif materialData.shader in ['RSkinShadowVolume.fx', 'MeshShadowVolume.fx']:
+                name = "SHADOW"
+            else:
+                texName = params.get("BaseTexture", "None")
+                name = texName[0:len(texName) - 4] + " Material"
+            mat = bpy.data.materials.new(name)
+            mat.shaderList.shaderList = shader
+            for param, value in params.items():
+                material_setters[param](mat, value)
+            mat['alamoContentKey'] = key
+            mat['alamoModelPath'] = self.modelPath
+            mat['alamoTextureOverride'] = self.textureOverride
+            self.materialsByKey[key] = mat
+            if self.materialMode == 'DEFERRED':
+                set_up_flat_material(mat)
+            else:
+                set_up_textures(mat, self.nodeGroupsByKey)
+        elif self.materialMode == 'FULL' and mat.get('alamoDeferred', False):
+            build_deferred_materials([mat], self.report, self.prefetch)
+        return mat
+
+    # proxy and connection functions
+
+    def apply_connections(self, connections, objects):
+        if len(connections) == 0:
+            return
+        armatureBlender = self.armatureObject
+        bones = armatureBlender.data.bones
+
+        # set connection of object to bone and move object to bone
+        for connection in connections:
+            if connection.objectIndex >= len(objects) or objects[connection.objectIndex] == None:
+                continue
+            obj = objects[connection.objectIndex]
+            bone = bones[connection.boneIndex]
+            if bone.name != 'Root':
+                constraint = obj.constraints.new('CHILD_OF')
+                constraint.target = armatureBlender
+                constraint.subtarget = bone.name
+
+    def apply_proxies(self, proxies):
+        if len(proxies) == 0:
+            return
+        armatureBlender = self.armatureObject
+        boneNames = [bone.name for bone in armatureBlender.data.bones]
+
+        bpy.context.view_layer.objects.active = armatureBlender
+        bpy.ops.object.mode_set(mode='EDIT')  # go to Edit mode
+        editBones = armatureBlender.data.edit_bones
+        for proxy in proxies:
+            bone = editBones[boneNames[proxy.boneIndex]]
+            bone.EnableProxy = True
+            bone.ProxyName = proxy.name
+            bone.proxyIsHidden = proxy.isHidden
+            bone.altDecreaseStayHidden = proxy.altDecreaseStayHidden
+        bpy.ops.object.mode_set(mode='OBJECT')  # go to Object mode
+
+    # Utility functions
+
+    def hide_object(self, object):
+        object.hide_set(True)
+        object.hide_render = True
+
+    def hide_objects(self, meshes, objects):
+        # group the imported meshes by LOD base name, the names from the file are used
+        # because Blender appends .001 to objects whose name is already taken
+        lodGroups = {}
+        for meshData, object in zip(meshes, objects):
+            if object == None:
+                continue
+            baseName, lod = alo_reader.split_lod_name(meshData.name)
+            if baseName != None:
+                lodGroups.setdefault(baseName, {})[lod] = object
+
+        # hides all but the most detailed LOD in Blender
+        for lods in lodGroups.values():
+            lodCounter = 0
+            while lodCounter in lods:
+                lodCounter += 1
+            for counter in range(lodCounter - 1):
+                self.hide_object(lods[counter])
+
+        for object in objects:
+            if object == None:
+                continue
+            # hide object if its a shadow or a collision
+            if len(object.material_slots) != 0:
+                shader = object.material_slots[0].material.shaderList.shaderList
+                if shader in shadow_collision_shaders:
+                    self.hide_object(object)
+                    continue
+            # hide objects that are set to not visible
+            if object.Hidden == True:
+                self.hide_object(object)
+
+    def delete_root(self):
+        armature = self.armatureObject
+        if armature == None:
+            return
+        armature.select_set(True)  # select the skeleton
+        bpy.context.view_layer.objects.active = armature
+
+        if bpy.ops.object.mode != 'EDIT':
+            bpy.ops.object.mode_set(mode='EDIT')
+        if 'Root' in armature.data.edit_bones:
+            armature.data.edit_bones.remove(
+                armature.data.edit_bones['Root'])
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+
+def load_animations(filePath):
+    # remove ending
+    path = os.path.dirname(filePath)
+    fileName = os.path.basename(filePath)[0:-4]
+    bpy.context.scene.modelFileName = fileName
+
+    animationFiles = []
+
+    for file in listdir(path):
+        fileExt = file[-4:]
+        if(fileExt.lower() == ".ala" and file[0:len(fileName)] == fileName):
+            animationFiles.append(file)
+
+    importer = import_ala.AnimationImporter()
+    arm = utils.findArmature()
+    arm.animation_data_create()
+
+    for animFile in animationFiles:
+        importer.loadAnimation(os.path.join(path, animFile))
+
+
+def new_import_collection(model):
+    fileName = os.path.basename(model.path)[0:-4]
+
+    importCollection = bpy.data.collections.new(fileName)
+    bpy.context.scene.collection.children.link(importCollection)
+    return importCollection
+
+
+def import_model_steps(model, importCollection, report, materialMode='FULL', textureOverride='NONE',
+                       importAnimations=True, prefetch=None, reuseMeshes=False, timer=None):
+    # generator version of import_model, yields (built, total) after every object of the model
+    if timer == None:
+        timer = PhaseTimer()
+
+    # meshes are tagged whenever the reader hashed the file, with mesh reuse or the model cache
+    builder = ModelBuilder(importCollection, report, materialMode, textureOverride, prefetch,
+                           model.contentHash, reuseMeshes, timer)
+    yield from builder.build_steps(model)
+    if(importAnimations):
+        with timer.phase("animations"):
+            load_animations(model.path)
+
+    with timer.phase("post-processing"):
+        for object in importCollection.objects:
+            for constraint in object.constraints:
+                constraint.inverse_matrix = mathutils.Matrix.Identity(4)
+
+
+def import_model(model, report, materialMode='FULL', textureOverride='NONE', importAnimations=True,
+                 prefetch=None, reuseMeshes=False, timer=None):
+    """Build a parsed model into a new collection named after its file, returns the collection"""
+    importCollection = new_import_collection(model)
+    for progress in import_model_steps(model, importCollection, report, materialMode, textureOverride,
+                                       importAnimations, prefetch, reuseMeshes, timer):
+        pass
+    return importCollection
+
+
+def remove_import(importCollection):
+    """Delete a partially imported collection with its objects and the data only they used"""
+    materials = set()
+    for object in list(importCollection.all_objects):
+        data = object.data
+        bpy.data.objects.remove(object)
+        if data == None or data.users != 0:
+            continue  # shared meshes of earlier imports are kept
+        if isinstance(data, bpy.types.Mesh):
+            materials.update(material for material in data.materials if material != None)
+            bpy.data.meshes.remove(data)
+        elif isinstance(data, bpy.types.Armature):
+            bpy.data.armatures.remove(data)
+    for material in materials:
+        if material.users == 0 and 'alamoContentKey' in material:
+            bpy.data.materials.remove(material)
+    bpy.data.collections.remove(importCollection)
+
+
+def standalone_reader():
+    """Load a copy of alo_reader from its file as the top level module alo_reader.
+
+    Worker processes can't import the add-on package since its __init__ needs bpy. Functions and
+    models of the copy are pickled under the top level name, which the workers import from the
+    directory their initializer adds to sys.path. sys.path of Blender itself is left alone.
+    """
+    module = sys.modules.get('alo_reader')
+    if module == None or getattr(module, '__file__', None) != alo_reader.__file__:
+        spec = importlib.util.spec_from_file_location('alo_reader', alo_reader.__file__)
+        module = importlib.util.module_from_spec(spec)
+        # registered before running it, dataclasses and pickle look the module up by name
+        sys.modules['alo_reader'] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+# options shared by the single file and the batch importer
+
+texture_override_description = "Try to import textures from a different submod"
+texture_override_items = (
+    ("NONE", "None", ""),
+    ('CoreSaga', "Core Saga", ""),
+    ('FotR', "Fall of the Republic", ""),
+    ('GCW', "Imperial Reign", ""),
+    ('Rev', "Revan's Revenge", ""),
+    ('TR', "Thrawn's Revenge", ""),
+)
+
+import_mode_description = "Parts of the model to import, skipped meshes aren't decoded"
+import_mode_items = (
+    ('ALL', "Everything", "Import the skeleton, proxies and every mesh"),
+    ('SKELETON', "Skeleton and Proxies", "Only import the skeleton, its proxies and attachment bones"),
+    ('NAMED', "Named Meshes", "Only import the meshes listed in Mesh Names"),
+    ('HIGHEST_LOD', "Highest LOD", "Skip every LOD except the most detailed one"),
+)
+# the batch importer has no mesh names to select from
+batch_import_mode_items = tuple(item for item in import_mode_items if item[0] != 'NAMED')
+
+material_mode_description = "How the materials of the model are set up"
+material_mode_items = (
+    ('FULL', "Full", "Load the textures and build the shader node trees"),
+    ('DEFERRED', "Deferred", "Only assign the shader properties and a flat colour, "
+                             "node trees are built later with Build Deferred Materials"),
+)
+
+reuse_meshes_description = ("Share the mesh data of earlier imports of the same file, "
+                            "only the armature and constraints are created again")
+
+timing_log_description = "Append the time spent in each phase of the import to this JSON lines file"
+
+
 class ALO_Importer(bpy.types.Operator):
     """ALO Importer"""      # blender will use this as a tooltip for menu items and buttons.
     bl_idname = "import_mesh.alo"        # unique identifier for buttons and menu items to reference.
@@ -63,1117 +1089,431 @@ class ALO_Importer(bpy.types.Operator):
 
     textureOverride: EnumProperty(
         name = "Submod Texture Override",
-        description = "Try to import textures from a different submod",
-        items=(
-            ("NONE", "None", ""),
-            ('CoreSaga', "Core Saga", ""),
-            ('FotR', "Fall of the Republic", ""),
-            ('GCW', "Imperial Reign", ""),
-            ('Rev', "Revan's Revenge", ""),
-            ('TR', "Thrawn's Revenge", ""),
-        ),
+        description = texture_override_description,
+        items=texture_override_items,
         default="NONE",
     )
 
+    importMode: EnumProperty(
+        name="Import",
+        description=import_mode_description,
+        items=import_mode_items,
+        default='ALL',
+    )
+
+    meshNames: StringProperty(
+        name="Mesh Names",
+        description="Comma separated names of the meshes to import, not case sensitive",
+        default="",
+    )
+
+    materialMode: EnumProperty(
+        name="Materials",
+        description=material_mode_description,
+        items=material_mode_items,
+        default='FULL',
+    )
+
+    prefetchTextures: BoolProperty(
+        name="Prefetch Textures",
+        description="Read the texture files in parallel during the import, "
+                    "otherwise they are read when they are first displayed",
+        default=False,
+    )
+
+    reuseMeshes: BoolProperty(
+        name="Reuse Meshes",
+        description=reuse_meshes_description,
+        default=False,
+    )
+
+    timingLog: StringProperty(
+        name="Timing Log",
+        description=timing_log_description,
+        subtype='FILE_PATH',
+        default="",
+    )
+
+    useCache: BoolProperty(
+        name="Use Model Cache",
+        description="Keep models imported with everything on disk, so importing an unchanged file "
+                    "again skips parsing it",
+        default=False,
+    )
+
     def draw(self, context):
         layout = self.layout
 
         layout.prop(self, "importAnimations")
         layout.prop(self, "parentName")
         layout.prop(self, "textureOverride")
+        layout.prop(self, "importMode")
+        if self.importMode == 'NAMED':
+            layout.prop(self, "meshNames")
+        layout.prop(self, "materialMode")
+        if self.materialMode == 'FULL':
+            layout.prop(self, "prefetchTextures")
+        layout.prop(self, "reuseMeshes")
+        layout.prop(self, "useCache")
+        layout.prop(self, "timingLog")
 
     filepath: StringProperty(
         name="File Path", description="Filepath used for importing the ALO file", maxlen=1024, default="")
 
     # execute() is called by blender when running the operator.
-    def execute(self, context):
-        # main structure
-
-        def process_active_junk():
-            meshNameList = []
-            # loop over file until end is reached
-            while(file.tell() < os.path.getsize(self.properties.filepath)):
-                active_chunk = file.read(4)
-                # print(active_chunk)
-                if active_chunk == b"\x00\x02\x00\00":
-                    armatureData = createArmature()
-                elif active_chunk == b"\x00\x04\x00\00":
-                    file.seek(4, 1)  # skip size
-                    meshName = processMeshChunk()
-                    meshNameList.append(meshName)
-                elif active_chunk == b"\x00\x13\x00\00":  # light chunk is irrelevant
-                    self.report({"WARNING"}, "ALAMO - File contains light objects, these are not supported and might cause minor issues")
-                    size = read_chunk_length()
-                    file.seek(size, 1)  # skip to next chunk
-                elif active_chunk == b"\x00\x06\x00\00":
-                    file.seek(8, 1)  # skip size and next header
-                    n_objects_proxies = get_n_objects_n_proxies()
-                    n_objects = n_objects_proxies['n_objects']
-                    n_proxies = n_objects_proxies['n_proxies']
-                    print('Found Connection Chunk')
-                elif active_chunk == b"\x02\x06\x00\00":
-                    file.seek(4, 1)  # skip size
-                    read_conncetion(armatureData, meshNameList)
-                elif active_chunk == b"\x03\x06\x00\00":
-                    read_proxy()
-
-        #armature and bones
-
-        class Armature():
-            def __init__(self):
-                self.bones = []
-                self.boneCount = 0
-
-        class Bone():
-            def __init__(self):
-                self.name = ''
-                self.parentIndex = 0
-                self.visible = 0
-                self.billboard = 0
-                self.matrix = None
-
-        def removeShadowDoubles():
-            for object in bpy.data.objects:
-                if(object.type == 'MESH'):
-                    if(len(object.material_slots) <= 0):
-                        continue  # already existing objects might not have a material
-                    shader = object.material_slots[0].material.shaderList.shaderList
-                    if (shader == 'MeshCollision.fx' or shader == 'RSkinShadowVolume.fx' or shader == 'MeshShadowVolume.fx'):
-                        bpy.ops.object.select_all(action='DESELECT')
-
-                        bpy.context.view_layer.objects.active = object
-                        object.select_set(True)
-                        bpy.ops.object.mode_set(mode='EDIT')
-                        bpy.ops.mesh.select_all(action='SELECT')
-                        bpy.ops.mesh.remove_doubles()
-                        bpy.ops.object.mode_set(mode='OBJECT')
-
-        def createArmature():
-
-            global fileName
-
-            # create armature
-            armatureBlender = bpy.data.armatures.new(fileName + "Armature")
-
-            # create object
-            armatureObj = bpy.data.objects.new(
-                fileName + "Rig", object_data=armatureBlender)
-
-            # Link object to collection
-            importCollection.objects.link(armatureObj)
-            bpy.context.view_layer.objects.active = armatureObj
-            bpy.context.view_layer.update()
-
-            # adjust settings and enter edit-mode
-            armatureObj = bpy.context.object
-            armatureObj.show_in_front = True
-            utils.setModeToEdit()
-
-            armatureBlender.display_type = 'STICK'
-            armatureData = Armature()
-
-            file.seek(4, 1)  # skip size
-            get_bone_count(armatureData)
-
-            counter = 0
-            while (counter < armatureData.boneCount):
-                process_bone(armatureData)
-                counter += 1
-
-            for bone in armatureData.bones:
-                createBone(bone, armatureBlender, armatureData)
-
-            bpy.ops.object.mode_set(mode='OBJECT')
-
-            bpy.context.scene.ActiveSkeleton.skeletonEnum = armatureObj.name
-
-            return armatureData
-
-        def get_bone_count(armatureData):
-            file.seek(8, 1)  # skip header and size
-            bone_count = struct.unpack("<I", file.read(4))[0]
-            armatureData.boneCount = bone_count
-            file.seek(124, 1)  # skip padding
-
-        def process_bone(armatureData):
-            bone = Bone()
-            armatureData.bones.append(bone)
-
-            file.seek(12, 1)  # skip header and size and next header
-            bone.name = cut_string(read_string())
-            file.seek(8, 1)  # skip header and size
-            bone.parentIndex = struct.unpack('<I', file.read(4))[0]
-            if bone.name == 'Root':
-                bone.parentIndex = 0
-            bone.visible = struct.unpack('<I', file.read(4))[0]
-            bone.billboard = struct.unpack('<I', file.read(4))[0]
-            matrix1_1 = struct.unpack('<f', file.read(4))[0]
-            matrix1_2 = struct.unpack('<f', file.read(4))[0]
-            matrix1_3 = struct.unpack('<f', file.read(4))[0]
-            matrix1_4 = struct.unpack('<f', file.read(4))[0]
-            matrix2_1 = struct.unpack('<f', file.read(4))[0]
-            matrix2_2 = struct.unpack('<f', file.read(4))[0]
-            matrix2_3 = struct.unpack('<f', file.read(4))[0]
-            matrix2_4 = struct.unpack('<f', file.read(4))[0]
-            matrix3_1 = struct.unpack('<f', file.read(4))[0]
-            matrix3_2 = struct.unpack('<f', file.read(4))[0]
-            matrix3_3 = struct.unpack('<f', file.read(4))[0]
-            matrix3_4 = struct.unpack('<f', file.read(4))[0]
-            bone_row_1 = ((matrix1_1, matrix1_2, matrix1_3, matrix1_4))
-            bone_row_2 = ((matrix2_1, matrix2_2, matrix2_3, matrix2_4))
-            bone_row_3 = ((matrix3_1, matrix3_2, matrix3_3, matrix3_4))
-            bone_row_4 = (0, 0, 0, 1)
-            bone.matrix = ((bone_row_1), (bone_row_2),
-                           (bone_row_3), (bone_row_4))
-
-        def createBone(boneData, armatureBlender, armatureData):
-            billboardModeArray = ["Disable", "Parallel", "Face", "ZAxis View",
-                                  "ZAxis Light", "ZAxis Wind", "Sunlight Glow", "Sun"]
-
-            bone_matrix = []  # initialize for use
-            bone = armatureBlender.edit_bones.new(boneData.name)
-            bone.tail = mathutils.Vector([0, 1, 0])
-
-            if boneData.visible == 1:
-                bone.Visible = True
-            else:
-                bone.Visible = False
-
-            parent = armatureData.bones[boneData.parentIndex].name
-            if(parent != 'Root'):
-                bone.parent = armatureBlender.edit_bones[parent]
-                bone.matrix = bone.parent.matrix @ mathutils.Matrix(
-                    boneData.matrix)
-            else:
-                bone.matrix = mathutils.Matrix(boneData.matrix)
-
-            bone.billboardMode.billboardMode = billboardModeArray[boneData.billboard]
-
-            bpy.ops.object.mode_set(mode='EDIT')
-
-        #mesh and material
-
-        class meshClass():
-            def __init__(self):
-                self.name = ''
-                self.isHidden = False
-                self.collision = False
-                self.nMaterials = 0
-                self.subMeshList = []
-
-            def getNVerts(self):
-                nVerts = 0
-                for subMesh in self.subMeshList:
-                    nVerts += subMesh.nVertices
-                return nVerts
-
-        class subMeshClass():
-            def __init__(self):
-                self.nVertices = 0
-                self.nFaces = 0
-                self.shader = None
-                self.vertices = []
-                self.faces = []
-                self.faceOffset = 0
-                self.UVs = []
-                self.material = None
-                self.animationMapping = []
-                self.boneIndex = []
-
-        def construct_mesh(currentMesh):
-
-            vertices = []
-            faces = []
-            UVs = []
-            animationMapping = []
-            for subMesh in currentMesh.subMeshList:
-                vertices += subMesh.vertices
-                faces += subMesh.faces
-                UVs += subMesh.UVs
-                animationMapping += subMesh.animationMapping
-
-            mesh.from_pydata(vertices, [], faces)
-
-            # Update mesh with new data
-            mesh.update(calc_edges=True)
-
-            polys = mesh.polygons
-            for p in polys:
-                p.use_smooth = True
-
-            # assign materials correctly
-            if currentMesh.nMaterials > 1:
-                currentSubMeshMaxFaceIndex = currentMesh.subMeshList[0].nFaces
-                subMeshCounter = 0
-                for face in mesh.polygons:
-                    if face.index >= currentSubMeshMaxFaceIndex:
-                        subMeshCounter += 1
-                        currentSubMeshMaxFaceIndex += currentMesh.subMeshList[subMeshCounter].nFaces
-                    face.material_index = subMeshCounter
-
-            # create UVs
-            createUVLayer("UVMap", UVs)
-            assign_vertex_groups(animationMapping, currentMesh)
-
-            return mesh
-
-        def readMeshInfo(currentMesh):
-            file.seek(8, 1)  # skip size and header
-
-            nMaterials = struct.unpack("I", file.read(4))[0]
-            currentMesh.nMaterials = nMaterials
-
-            file.seek(24 + 4, 1)  # skip bounding box size and unused
-            isHidden = struct.unpack("<I", file.read(4))[0]
-
-            if isHidden == 1:
-                currentMesh.isHidden = True
-
-            collision = struct.unpack("<I", file.read(4))[0]
-            if collision == 1:
-                currentMesh.collision = True
-
-            file.seek(88, 1)
-            create_object(currentMesh)
-
-        def get_mesh_name():
-            file.seek(4, 1)  # skip header
-            length = read_chunk_length()
-            counter = 0
-            mesh_name = ""
-            while counter < length - 1:
-                letter = str(file.read(1))
-                letter = letter[2:len(letter) - 1]
-                mesh_name += letter
-                counter += 1
-            file.seek(1, 1)  # skip end byte of name
-
-            return cut_string(mesh_name)
-
-        def get_n_vertices_n_primitives(currentSubMesh):
-            currentSubMesh.nVertices = struct.unpack("<I", file.read(4))[0]
-            currentSubMesh.nFaces = struct.unpack("<I", file.read(4))[0]
-            file.seek(120, 1)
-
-        def processMeshChunk():
-            # name chunk
-            currentMesh = meshClass()
-            meshList.append(currentMesh)
-            currentMesh.name = get_mesh_name()
-
-            readMeshInfo(currentMesh)
-
-            counter = 0
-            faceOffset = 0
-            while (counter < currentMesh.nMaterials):
-                currentSubMesh = subMeshClass()
-                currentMesh.subMeshList.append(currentSubMesh)
-
-                currentSubMesh.faceOffset = faceOffset
-                read_material_info_chunk(currentSubMesh)
-                read_mesh_data(currentSubMesh)
-                faceOffset += currentSubMesh.nVertices
-                counter += 1
-
-            contructed_mesh = construct_mesh(currentMesh)
-            name = contructed_mesh.name
-            return name
-
-        def read_mesh_data(currentSubMesh):
-            file.seek(4, 1)  # skip header
-            meshDataChunkSize = read_chunk_length()
-            currentPosition = file.tell()
-            while (file.tell() < currentPosition + meshDataChunkSize):
-                active_chunk = file.read(4)
-                if active_chunk == b"\x01\x00\x01\00":
-                    file.seek(4, 1)  # skip size, chunk is always 128 byte
-                    get_n_vertices_n_primitives(currentSubMesh)
-                elif active_chunk == b"\x02\x00\x01\00":
-                    size = read_chunk_length()
-                    file.seek(size, 1)  # skip to next chunk
-                elif active_chunk == b"\x04\x00\x01\00":
-                    file.seek(4, 1)  # skip size
-                    faces = process_index_buffer(currentSubMesh)
-                elif active_chunk == b"\x06\x00\x01\00":
-                    read_animation_mapping(currentSubMesh)
-                elif active_chunk == b"\x07\x00\x01\00":
-                    file.seek(4, 1)  # skip size
-                    vertex_data = process_vertex_buffer_2(
-                        False, currentSubMesh)
-                elif active_chunk == b"\x05\x00\x01\00":
-                    file.seek(4, 1)  # skip size
-                    # old version of the chunk
-                    vertex_data = process_vertex_buffer_2(True, currentSubMesh)
-                elif active_chunk == b"\x00\x12\x00\00":
-                    size = read_chunk_length()
-                    file.seek(size, 1)  # skip to next chunk
-
-        def read_material_info_chunk(currentSubMesh):
-            file.seek(4, 1)  # skip header
-            materialChunkSize = read_chunk_length()
-            currentPosition = file.tell()
-            while (file.tell() < currentPosition + materialChunkSize):
-                active_chunk = file.read(4)
-                if active_chunk == b"\x01\x01\x01\00":
-                    set_alamo_shader(currentSubMesh)
-                elif active_chunk == b"\x02\x01\x01\00":
-                    read_int(currentSubMesh.material)
-                elif active_chunk == b"\x03\x01\x01\00":
-                    read_float(currentSubMesh.material)
-                elif active_chunk == b"\x04\x01\x01\00":
-                    read_float3(currentSubMesh.material)
-                elif active_chunk == b"\x05\x01\x01\00":
-                    process_texture_chunk(currentSubMesh.material)
-                elif active_chunk == b"\x06\x01\x01\00":
-                    read_float4(currentSubMesh.material)
-            create_material(currentSubMesh)
-            set_up_textures(currentSubMesh.material)
-
-        def read_animation_mapping(currentSubMesh):
-            chunk_size = read_chunk_length()  # read chunk size
-            read_counter = chunk_size / 4
-            counter = 0
-            animation_mapping = []
-            while counter < read_counter:
-                currentSubMesh.animationMapping.append(
-                    struct.unpack("I", file.read(4))[0])
-                counter += 1
-            return animation_mapping
-
-        def material_group_additive(context, operator, group_name, material, is_emissive):
-            node_group = bpy.data.node_groups.new(group_name, 'ShaderNodeTree')
-
-            node = node_group.nodes.new
-            link = node_group.links.new
-
-            group_out = node('NodeGroupOutput')
-            group_out.location.x += 200.0
-            node_group.interface.new_socket(socket_type='NodeSocketShader', name='Surface', in_out='OUTPUT')
-
-            mix_shader = node("ShaderNodeMixShader")
-
-            transparent = node("ShaderNodeBsdfTransparent")
-            transparent.location.x -= 200
-            transparent.location.y -= 50
-
-            base_image_node = node("ShaderNodeTexImage")
-            base_image_node.location.x -= 500
-
-            if is_emissive:
-                group_in = node('NodeGroupInput')
-                group_in.location.x -= 700
-                emissive = node_group.interface.new_socket(socket_type='NodeSocketFloat',
-                                                           name='Emissive Strength',
-                                                           in_out='INPUT')
-                emissive.default_value = 100.0
-                color = node("ShaderNodeEmission")
-                link(group_in.outputs[0], color.inputs[1])
-                eevee_alpha_fix = node("ShaderNodeInvert")
-                eevee_alpha_fix.location.x -= 500
-                eevee_alpha_fix.location.y += 300
-                # Fix for obnoxious transparency bug in Eevee
-                link(base_image_node.outputs[1], eevee_alpha_fix.inputs[1])
-                link(base_image_node.outputs['Color'],
-                     mix_shader.inputs['Fac'])
-
-            else:
-                color = node("ShaderNodeBsdfDiffuse")
-                link(base_image_node.outputs['Alpha'],
-                     mix_shader.inputs['Fac'])
+    # plain attributes, not properties, so a redo from Adjust Last Operation runs execute synchronously
+    # invoke turns on the modal import, cancel can run before execute when the file browser is dismissed
+    runModal = False
+    modalTimer = None
+    parseExecutor = None
+    texturePrefetch = None
+    importCollection = None
+    steps = None
+    activeArmatureBackup = 'None'
+
+    # seconds of work done per timer event of the modal import, short enough to keep the interface responsive
+    slice_seconds = 0.05
+
+    def start_import(self):
+        # is changed due to implementation details in the enum callback
+        self.activeArmatureBackup = 'None'
+        originalArmature = utils.findArmature()
+        if(originalArmature != None):
+            self.activeArmatureBackup = originalArmature.name
+
+        # texture files are read in the background while the model is built
+        self.texturePrefetch = None
+        if self.prefetchTextures and self.materialMode == 'FULL':
+            self.texturePrefetch = ThreadPoolExecutor()
+        self.timer = PhaseTimer()
+        self.cache = model_cache.ModelCache() if self.useCache else None
+        self.importCollection = None
+        self.steps = None
+        self.progress = (0, 0)
+
+    def start_build(self, model):
+        self.importCollection = new_import_collection(model)
+        self.steps = import_model_steps(model, self.importCollection, self.report, self.materialMode,
+                                        self.properties.textureOverride, self.importAnimations,
+                                        self.texturePrefetch, self.reuseMeshes, self.timer)
+
+    def finish_import(self):
+        filepath = self.properties.filepath
+        timer = self.timer
+        if self.texturePrefetch != None:
+            with timer.phase("textures"):
+                self.texturePrefetch.shutdown(wait=True)
 
-            color.location.x -= 200
-            color.location.y -= 150
+        # restore previous active armature
+        activeArmatureBackup = self.activeArmatureBackup
+        if(activeArmatureBackup != 'None'):
+            createdArmature = utils.findArmature()  # get new armature
+            bpy.context.scene.ActiveSkeleton.skeletonEnum = activeArmatureBackup  # restore
+            armature = utils.findArmature()
+            # set parent
+            if(self.parentName != 'None' and armature != None):
+                parentBone = armature.data.bones[self.parentName]
+                if(parentBone != None):
+                    createdArmature.parent = armature
+                    createdArmature.parent_bone = self.parentName
+                    createdArmature.parent_type = 'BONE'
 
-            link(base_image_node.outputs['Color'], color.inputs[0])
-            link(transparent.outputs[0], mix_shader.inputs[1])
-            link(color.outputs[0], mix_shader.inputs[2])
+        self.report({"INFO"}, f'ALAMO - Imported {os.path.basename(filepath)} in {timer.summary()}')
+        if self.timingLog != "":
+            try:
+                write_timing_log(self.timingLog, filepath, timer)
+            except OSError as error:
+                self.report({"WARNING"}, f'ALAMO - Could not write the timing log: {error}')
+        return {'FINISHED'}            # this lets blender know the operator finished successfully.
 
-            if material.BaseTexture != 'None' and material.BaseTexture in bpy.data.images:
-                diffuse_texture = bpy.data.images[material.BaseTexture]
-                diffuse_texture.alpha_mode = 'CHANNEL_PACKED'
-                base_image_node.image = diffuse_texture
+    def execute(self, context):
+        filepath = self.properties.filepath
+        self.start_import()
+
+        if self.runModal:
+            # the file is parsed on a background thread, the reader doesn't touch bpy
+            self.parseStart = time.perf_counter()
+            self.parseExecutor = ThreadPoolExecutor(max_workers=1)
+            self.parseFuture = self.parseExecutor.submit(model_cache.read_model, filepath, self.importMode,
+                                                         self.meshNames, self.cache, self.reuseMeshes)
+            windowManager = context.window_manager
+            self.modalTimer = windowManager.event_timer_add(0.01, window=context.window)
+            windowManager.modal_handler_add(self)
+            return {'RUNNING_MODAL'}
+
+        # scripts get the whole import in one call
+        with self.timer.phase("chunk parse"):
+            try:
+                model = model_cache.read_model(filepath, self.importMode, self.meshNames, self.cache,
+                                               self.reuseMeshes)
+            except ValueError as error:
+                return self.read_failed(context, error)
+        self.start_build(model)
+        for progress in self.steps:
+            pass
+        return self.finish_import()
+
+    def import_step(self):
+        # does a small part of the import, returns False once there is nothing left to do
+        if self.steps == None:
+            self.timer.record("chunk parse", time.perf_counter() - self.parseStart)
+            self.parseExecutor.shutdown(wait=False)
+            self.start_build(self.parseFuture.result())
+            return True
+        try:
+            self.progress = next(self.steps)
+        except StopIteration:
+            return False
+        return True
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            self.cancel(context)
+            self.report({"INFO"}, 'ALAMO - Import cancelled')
+            return {'CANCELLED'}
+        if event.type in {'Z', 'Y'} and (event.ctrl or event.oskey):
+            return {'RUNNING_MODAL'}  # undo would free the data the builder holds on to between slices
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        if not self.import_valid():
+            # undone from a menu or deleted by another operator, the builder's references are stale
+            self.cancel(context)
+            self.report({"WARNING"}, 'ALAMO - Import stopped, its collection was removed during the import')
+            return {'CANCELLED'}
+
+        deadline = time.perf_counter() + self.slice_seconds
+        try:
+            # at least one step per event, so even slow steps make progress
+            while self.steps != None or self.parseFuture.done():
+                if self.steps == None and isinstance(self.parseFuture.exception(), ValueError):
+                    return self.read_failed(context, self.parseFuture.exception())
+                if not self.import_step():
+                    self.stop_modal(context)
+                    return self.finish_import()
+                if time.perf_counter() >= deadline:
+                    break
+        except Exception:
+            self.cancel(context)
+            raise
+
+        if self.steps == None:
+            status = f"Reading {os.path.basename(self.properties.filepath)}"
+        else:
+            status = f"Importing {self.importCollection.name}: {self.progress[0]} of {self.progress[1]} objects"
+        context.workspace.status_text_set(status + ", Esc to cancel")
+        return {'RUNNING_MODAL'}
 
-            link(mix_shader.outputs[0], group_out.inputs[0])
+    def import_valid(self):
+        if self.importCollection == None:
+            return True
+        try:
+            return self.importCollection.name in bpy.data.collections
+        except ReferenceError:
+            return False
 
-            return node_group
+    def read_failed(self, context, error):
+        # damaged files are reported instead of raising, nothing has been built yet
+        self.cancel(context)
+        self.report({"ERROR"}, f'ALAMO - Could not read {os.path.basename(self.properties.filepath)}: {error}')
+        return {'CANCELLED'}
+
+    def stop_modal(self, context):
+        if self.modalTimer == None:
+            return
+        context.window_manager.event_timer_remove(self.modalTimer)
+        self.modalTimer = None
+        context.workspace.status_text_set(None)
+
+    def cancel(self, context):
+        # called on Escape, on errors and by Blender when the window closes, undoes the partial import
+        self.stop_modal(context)
+        if self.parseExecutor != None:
+            self.parseExecutor.shutdown(wait=False)
+        if self.steps != None:
+            self.steps.close()  # leaves the builder's edit modes and progress bar
+        if self.texturePrefetch != None:
+            self.texturePrefetch.shutdown(wait=False, cancel_futures=True)
+        if self.importCollection != None:
+            if self.import_valid():
+                remove_import(self.importCollection)
+            self.importCollection = None
+            # build_armature made the deleted rig the active skeleton, the previous one or none is restored
+            activeSkeleton = 'None'
+            if self.activeArmatureBackup != 'None' and self.activeArmatureBackup in bpy.data.objects:
+                activeSkeleton = self.activeArmatureBackup
+            bpy.context.scene.ActiveSkeleton.skeletonEnum = activeSkeleton
 
-        def material_group_basic(context, operator, group_name, material):
-            node_group = bpy.data.node_groups.new(group_name, 'ShaderNodeTree')
+    def invoke(self, context, event):
+        self.runModal = True
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
 
-            node = node_group.nodes.new
-            link = node_group.links.new
 
-            group_in = node('NodeGroupInput')
-            group_in.location.x -= 700
-            node_group.interface.new_socket(socket_type='NodeSocketColor',
-                                            name='Team Color',
-                                            in_out='INPUT')
-            spec = node_group.interface.new_socket(socket_type='NodeSocketFloat',
-                                                   name='Specular Intensity',
-                                                   in_out='INPUT')
-            spec.default_value = 0.1
-
-            group_out = node('NodeGroupOutput')
-            node_group.interface.new_socket(socket_type='NodeSocketColor',
-                                            name='Base Color',
-                                            in_out='OUTPUT')
-            node_group.interface.new_socket(socket_type='NodeSocketFloat',
-                                            name='Specular',
-                                            in_out='OUTPUT')
-            node_group.interface.new_socket(socket_type='NodeSocketVector',
-                                            name='Normal',
-                                            in_out='OUTPUT')
-
-            base_image_node = node("ShaderNodeTexImage")
-            base_image_node.location.x -= 500
-
-            mix_node = node("ShaderNodeMixRGB")
-            mix_node.blend_type = 'COLOR'
-            mix_node.location.x -= 200
-
-            link(base_image_node.outputs['Color'], mix_node.inputs['Color1'])
-            link(base_image_node.outputs['Alpha'], mix_node.inputs['Fac'])
-            link(mix_node.outputs['Color'], group_out.inputs['Base Color'])
-
-            normal_image_node = node("ShaderNodeTexImage")
-            normal_image_node.location.x -= 1100.0
-            normal_image_node.location.y -= 300.0
-
-            normal_split = node("ShaderNodeSeparateRGB")
-            normal_split.location.x -= 800
-            normal_split.location.y -= 300
-            normal_invert = node("ShaderNodeMath")
-            normal_invert.operation = 'SUBTRACT'
-            normal_invert.inputs[0].default_value = 1
-            normal_invert.location.x -= 600
-            normal_invert.location.y -= 300
-            normal_combine = node("ShaderNodeCombineRGB")
-            normal_combine.location.x -= 400
-            normal_combine.location.y -= 300
-
-            normal_map_node = node("ShaderNodeNormalMap")
-            normal_map_node.space = 'TANGENT'
-            normal_map_node.location.x -= 200.0
-            normal_map_node.location.y -= 300.0
-
-            specular_multiply = node("ShaderNodeMath")
-            specular_multiply.operation = 'MULTIPLY'
-            specular_multiply.location.x -= 800
-            specular_multiply.location.y -= 100
-
-            link(normal_image_node.outputs['Color'],
-                 normal_split.inputs['Image'])
-            link(normal_split.outputs['R'], normal_combine.inputs['R'])
-            link(normal_split.outputs['G'], normal_invert.inputs[1])
-            link(normal_invert.outputs[0], normal_combine.inputs['G'])
-            link(normal_split.outputs['B'], normal_combine.inputs['B'])
-            link(normal_combine.outputs[0], normal_map_node.inputs[1])
-            link(normal_map_node.outputs[0], group_out.inputs[2])
-
-            link(normal_image_node.outputs['Alpha'],
-                 specular_multiply.inputs[0])
-
-            link(group_in.outputs['Team Color'], mix_node.inputs['Color2'])
-            link(group_in.outputs['Specular Intensity'],
-                 specular_multiply.inputs[1])
-            link(specular_multiply.outputs[0], group_out.inputs[1])
-
-            if material.BaseTexture != 'None' and material.BaseTexture in bpy.data.images:
-                diffuse_texture = bpy.data.images[material.BaseTexture]
-                diffuse_texture.alpha_mode = 'CHANNEL_PACKED'
-                base_image_node.image = diffuse_texture
-
-            if material.NormalTexture != 'None' and material.NormalTexture in bpy.data.images:
-                normal_texture = bpy.data.images[material.NormalTexture]
-                normal_texture.alpha_mode = 'CHANNEL_PACKED'
-                normal_image_node.image = normal_texture
-                normal_image_node.image.colorspace_settings.name = 'Non-Color'
-
-            return node_group
-
-        def set_up_textures(material):
-            material.use_nodes = True
-            nt = material.node_tree
-            nodes = nt.nodes
-            links = nt.links
-            
-            # clean up
-            while(nodes):
-                nodes.remove(nodes[0])
-
-            output = nodes.new("ShaderNodeOutputMaterial")
-            custom_node_name = material.name + "Group"
-            my_group = 'null'
-
-            if ("Additive" in material.shaderList.shaderList):
-                material.blend_method = "BLEND"
-                my_group = material_group_additive(
-                    self, context, custom_node_name, material, True)
-                mat_group = nt.nodes.new("ShaderNodeGroup")
-                mat_group.node_tree = bpy.data.node_groups[my_group.name]
-                mat_group.location.x -= 200.0
-                links.new(mat_group.outputs[0], output.inputs['Surface'])
-            elif ("Alpha" in material.shaderList.shaderList):
-                material.blend_method = "BLEND"
-                my_group = material_group_additive(
-                    self, context, custom_node_name, material, False)
-                mat_group = nt.nodes.new("ShaderNodeGroup")
-                mat_group.node_tree = bpy.data.node_groups[my_group.name]
-                mat_group.location.x -= 200.0
-                links.new(mat_group.outputs[0], output.inputs['Surface'])
-            else:
-                bsdf = nodes.new("ShaderNodeBsdfPrincipled")
-                bsdf.inputs['Metallic'].default_value = 0.1
-                bsdf.inputs['Roughness'].default_value = 0.2
-                bsdf.location.x -= 300.0
-                links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
-                my_group = material_group_basic(
-                    self, context, custom_node_name, material)
-                mat_group = nt.nodes.new("ShaderNodeGroup")
-                mat_group.node_tree = bpy.data.node_groups[my_group.name]
-                mat_group.location.x -= 500.0
-                links.new(mat_group.outputs[0], bsdf.inputs['Base Color'])
-                links.new(mat_group.outputs[1], bsdf.inputs[5])
-                links.new(mat_group.outputs[2], bsdf.inputs['Normal'])
-
-        def create_material(currentSubMesh):
-            if currentSubMesh.material.name != "DUMMYMATERIAL":
-                return
-
-            oldMat = currentSubMesh.material
-
-            texName = currentSubMesh.material.BaseTexture
-            texName = texName[0:len(texName) - 4] + " Material"
-            if texName in bpy.data.materials and oldMat.shaderList.shaderList != bpy.data.materials.get(texName).shaderList.shaderList:
-                texName += "1"
-            mat = assign_material(texName)
-
-            mat.shaderList.shaderList = oldMat.shaderList.shaderList
-
-            # TODO: Extract set_alamo_shader's shader finder to new function, use that here.
-            material_props = ["BaseTexture", "NormalTexture", "GlossTexture", "WaveTexture", "DistortionTexture", "CloudTexture", "CloudNormalTexture", "Emissive", "Diffuse", "Specular", "Shininess", "Colorization", "DebugColor", "UVOffset", "Color", "UVScrollRate", "DiffuseColor",
-                              "EdgeBrightness", "BaseUVScale", "WaveUVScale", "DistortUVScale", "BaseUVScrollRate", "WaveUVScrollRate", "DistortUVScrollRate", "BendScale", "Diffuse1", "CloudScrollRate", "CloudScale", "SFreq",  "TFreq", "DistortionScale", "Atmosphere", "CityColor", "AtmospherePower", "SpecularTexture", "UVOffsetX", "UVOffsetY", "UVScaleFactor", "MaskTexture"]
-
-            for texture in material_props:
-                if texture in oldMat:
-                    mat[texture] = oldMat[texture]
-
-            obj = bpy.context.object
-            materials = []
-            for material in obj.data.materials:
-                if material.name != "DUMMYMATERIAL":
-                    materials.append(material)
-            obj.data.materials.clear()
-            for material in materials:
-                obj.data.materials.append(material)
-            obj.data.materials.append(mat)
-            currentSubMesh.material = mat
-
-        def assign_material(name):
-            if name in bpy.data.materials:
-                return bpy.data.materials.get(name)
-            else:
-                return bpy.data.materials.new(name)
+class ALO_BatchImporter(bpy.types.Operator):
+    """Import several ALO files, the files are parsed in parallel by worker processes"""
+    bl_idname = "import_mesh.alo_batch"
+    bl_label = "Batch Import ALO Files"
+    bl_options = {'REGISTER', 'UNDO'}
+    filename_ext = ".alo"
+    filter_glob: StringProperty(default="*.alo", options={'HIDDEN'})
 
+    directory: StringProperty(subtype='DIR_PATH')
 
-        def create_object(currentMesh):
-            global mesh
-            mesh = bpy.data.meshes.new(currentMesh.name)
-            object = bpy.data.objects.new(mesh.name, mesh)
-            global MeshNameList
-            MeshNameList.append(object.name)
+    files: CollectionProperty(
+        name="File Paths",
+        description="Files to import, every ALO file of the directory is imported if none are selected",
+        type=bpy.types.OperatorFileListElement,
+    )
 
-            # Link object to collection
-            importCollection.objects.link(object)
-            bpy.context.view_layer.objects.active = object
-            bpy.context.view_layer.update()
+    importAnimations: BoolProperty(
+        name="Import Animations",
+        description="Import the animations of each model from the same path",
+        default=False,
+    )
 
-            context.view_layer.objects.active = object  # make created object active
-            object.show_transparent = True
+    textureOverride: EnumProperty(
+        name = "Submod Texture Override",
+        description = texture_override_description,
+        items=texture_override_items,
+        default="NONE",
+    )
 
-            if (currentMesh.isHidden == 1):
-                object.Hidden = True
+    importMode: EnumProperty(
+        name="Import",
+        description=import_mode_description,
+        items=batch_import_mode_items,
+        default='ALL',
+    )
 
-            if (currentMesh.collision == 1):
-                object.HasCollision = True
+    materialMode: EnumProperty(
+        name="Materials",
+        description=material_mode_description,
+        items=material_mode_items,
+        default='DEFERRED',
+    )
 
-            # create vertex groups
-            armature = utils.findArmature()
-            for bone in armature.data.bones:
-                vertgroup = object.vertex_groups.new(name=bone.name)
-
-        def process_vertex_buffer_2(legacy, currentSubMesh):
-            f = struct.Struct('f')  # unpack as float
-            i = struct.Struct('I')
-            counter = 0
-            while counter < currentSubMesh.nVertices:
-                coX = f.unpack(file.read(4))[0]
-                coY = f.unpack(file.read(4))[0]
-                coZ = f.unpack(file.read(4))[0]
-                currentSubMesh.vertices.append(
-                    mathutils.Vector((coX, coY, coZ)))
-                file.seek(12, 1)
-                UV = []
-                UV.append(f.unpack(file.read(4))[0])
-                UV.append(f.unpack(file.read(4))[0] * (-1))
-                currentSubMesh.UVs.append(UV)
-                file.seek(64, 1)
-                if not legacy:
-                    file.seek(16, 1)
-                currentSubMesh.boneIndex.append(i.unpack(file.read(4))[0])
-                file.seek(28, 1)
-                counter += 1
-
-        def process_index_buffer(currentSubMesh):
-            h = struct.Struct('H')  # unpack as unsigned Short
-            counter = 0
-            while counter < currentSubMesh.nFaces:
-                face = []
-                face.append(h.unpack(file.read(2))[
-                            0] + currentSubMesh.faceOffset)
-                face.append(h.unpack(file.read(2))[
-                            0] + currentSubMesh.faceOffset)
-                face.append(h.unpack(file.read(2))[
-                            0] + currentSubMesh.faceOffset)
-                currentSubMesh.faces.append(face)
-                counter += 1
-
-        def process_texture_chunk(material):
-            file.seek(5, 1)  # skip chunk size and child header
-            length = struct.unpack("H", file.read(
-                1) + b'\x00')  # get string length
-            global texture_function_name
-            texture_function_name = ""
-            counter = 0
-            while counter < length[0] - 1:
-                letter = str(file.read(1))
-                letter = letter[2:len(letter) - 1]
-                texture_function_name = texture_function_name + letter
-                counter += 1
-            file.seek(1, 1)  # skip string end byte
-            file.seek(1, 1)  # skip child header
-            length = struct.unpack("H", file.read(1) + b'\x00')  # get string length
-            texture_name = ""
-            counter = 0
-            while counter < length[0] - 1:
-                letter = str(file.read(1))
-                letter = letter[2:len(letter) - 1]
-                texture_name = texture_name + letter
-                counter += 1
-            # replace texture format with .dds
-            if texture_name != "None":
-                texture_name = texture_name[0:len(texture_name) - 4] + ".dds"
-            file.seek(1, 1)  # skip string end byte
-            
-            load_image(texture_name)
-            exec('material.' + texture_function_name + '= texture_name')
-
-        def createUVLayer(layerName, uv_coordinates):
-            vert_uvs = uv_coordinates
-            mesh.uv_layers.new(name=layerName)
-            mesh.uv_layers[-1].data.foreach_set(
-                "uv", [uv for pair in [vert_uvs[l.vertex_index] for l in mesh.loops] for uv in pair])
-
-        def set_alamo_shader(currentSubMesh):  # create material and assign
-            shaderName = read_string()
-            obj = bpy.context.object
-
-            if shaderName == 'MeshCollision.fx':
-                mat = assign_material("COLLISION")
-            elif shaderName in ['RSkinShadowVolume.fx', 'MeshShadowVolume.fx']:
-                mat = assign_material("SHADOW")
-            else:
-                mat = assign_material("DUMMYMATERIAL")
-                # DUMMYMATERIAL is a temporary material to allow Alamo shader properties to be assigned.
-                # Can't assign final material because material names are now based on BaseTexture, and textures aren't known yet. Probably a better way to do this.
-
-            # find shader, ignoring case
-            currentKey = None
-            for key in settings.material_parameter_dict:
-                if(key.lower() == shaderName.lower()):
-                    currentKey = key
-                    break
+    reuseMeshes: BoolProperty(
+        name="Reuse Meshes",
+        description=reuse_meshes_description,
+        default=False,
+    )
 
-            if currentKey is None:
-                self.report({"WARNING"}, "ALAMO - Unknown shader: " + shaderName +
-                      " setting shader to alDefault.fx")
-                currentKey = "alDefault.fx"
-
-            mat.shaderList.shaderList = currentKey
-
-            obj.data.materials.append(mat)
-            currentSubMesh.material = mat
-
-        def assign_vertex_groups(animation_mapping, currentMesh):
-            # assign vertex groups
-            object = bpy.context.view_layer.objects.active
-            counter = 0
-            armatureObject = utils.findArmature()
-            n_vertices = currentMesh.getNVerts()
-
-            bone_indices = []
-            for subMesh in currentMesh.subMeshList:
-                bone_indices += subMesh.boneIndex
-
-            if(len(animation_mapping) != 0):
-                # add armature modifier
-                mod = object.modifiers.new('MyRigModif', 'ARMATURE')
-                mod.object = armatureObject
-                mod.use_bone_envelopes = False
-                mod.use_vertex_groups = True
-
-                while counter < n_vertices:
-                    object.vertex_groups[animation_mapping[bone_indices[counter]]].add([
-                                                                                       counter], 1, 'ADD')
-                    counter += 1
-
-        # proxy and connection functions
-
-        def get_n_objects_n_proxies():
-            size = read_chunk_length()
-            file.seek(2, 1)
-            n_objects = struct.unpack("i", file.read(4))
-            file.seek(2, 1)
-            n_proxies = struct.unpack("i", file.read(4))
-            n_objects_proxies = {
-                "n_objects": n_objects[0], "n_proxies": n_proxies[0]}
-
-            # some .alo formats have an additional unspecified value at this position
-            # to read the rest correctly this code checks if this is the case here and skips appropriately
-            size -= 12
-            file.seek(size, 1)
-
-            return n_objects_proxies
-
-        def read_conncetion(armatureData, meshNameList):
-            file.seek(2, 1)  # skip head and size
-            mesh_index = struct.unpack("I", file.read(4))[0]
-            file.seek(2, 1)  # skip head and size
-            bone_index = struct.unpack("I", file.read(4))[0]
-            armatureBlender = utils.findArmature()
-
-            # set connection of object to bone and move object to bone
-            obj = None
-            if mesh_index < len(meshNameList):  # light objects can mess this up
-                obj = bpy.data.objects[meshNameList[mesh_index]]
-            bone = armatureBlender.data.bones[bone_index]
-            if obj != None:
-                if bone.name != 'Root':
-                    constraint = obj.constraints.new('CHILD_OF')
-                    constraint.target = armatureBlender
-                    constraint.subtarget = bone.name
-
-        def read_proxy():
-            chunk_length = struct.unpack("I", file.read(4))[0]
-            file.seek(1, 1)  # skip header
-            name_length = struct.unpack("B", file.read(1))[0]
-            proxy_name = ""
-            counter = 0
-            while counter < name_length - 1:
-                letter = str(file.read(1))
-                letter = letter[2:len(letter) - 1]
-                proxy_name = proxy_name + letter
-                counter += 1
-            file.seek(3, 1)  # skip endbyte of name, chunk mini header and size
-            proxy_bone_index = struct.unpack("<I", file.read(4))[0]
-
-            proxyIsHidden = False
-            altDecreaseStayHidden = False
-            counter = 0
-            while (name_length + 9 + counter < chunk_length):
-                mini_chunk = file.read(1)
-                file.seek(1, 1)
-                if mini_chunk == b"\x07":
-                    if struct.unpack("<I", file.read(4))[0] == 1:
-                        proxyIsHidden = True
-                elif mini_chunk == b"\x08":
-                    if struct.unpack("<I", file.read(4))[0] == 1:
-                        altDecreaseStayHidden = True
-                counter += 6
-
-            armatureBlender = utils.findArmature()
-
-            bpy.context.view_layer.objects.active = armatureBlender
-            bpy.ops.object.mode_set(mode='EDIT')  # go to Edit mode
-            bone = armatureBlender.data.edit_bones[armatureBlender.data.bones[proxy_bone_index].name]
-            bone.EnableProxy = True
-            bone.ProxyName = proxy_name
-            bone.proxyIsHidden = proxyIsHidden
-            bone.altDecreaseStayHidden = altDecreaseStayHidden
-            bpy.ops.object.mode_set(mode='OBJECT')  # go to Edit mode
-
-        # Utility functions
-
-        def read_chunk_length():
-            # the hight bit is used to tell if chunk holds data or chunks, so if it is set it has to be ignored when calculating length
-            length = struct.unpack("<I", file.read(4))[0]
-            if length >= 2147483648:
-                length -= 2147483648
-            return length
-
-        def cut_string(string):
-            # bones have a 63 character limit, this function cuts longer strings with space for .xyz end used by blender to distinguish double name
-            if(len(string) > 63):
-                return string[0:59]
-            else:
-                return string
-
-        def read_string():
-            # reads string out of chunk containing only a string
-            length = struct.unpack("I", file.read(4))  # get string length
-            string = ""
-            counter = 0
-            while counter < length[0] - 1:
-                letter = str(file.read(1))
-                letter = letter[2:len(letter) - 1]
-                string = string + letter
-                counter += 1
-            file.seek(1, 1)  # skip end byte of name
-            return string
-
-        def read_string_mini_chunk():
-            file.seek(1, 1)  # skip chunk header
-            size = length = struct.unpack("<b", file.read(1))[0]
-            string = ""
-            counter = 0
-            while counter < length - 1:
-                letter = str(file.read(1))
-                letter = letter[2:len(letter) - 1]
-                string = string + letter
-                counter += 1
-            file.seek(1, 1)  # skip end byte of name
-            return string
-        
-        def hideObject(object):
-
-            # set correct area type via context overwrite
-            area = None
-            for window in bpy.context.window_manager.windows:
-                screen = window.screen
-                for a in screen.areas:
-                    if a.type == 'VIEW_3D':
-                        area = a
-                        break
-            with context.temp_override(area=area):
-                bpy.ops.object.select_all(action='DESELECT')
-                object.select_set(True)
-                bpy.ops.object.hide_view_set()
-                object.hide_render = True
-
-        def hideLODs():
-            # hides all but the most detailed LOD in Blender
-            for object in bpy.data.objects:
-                if(object.type == 'MESH'):
-                    # check if name ends with LOD
-                    if object.name[len(object.name)-4:len(object.name)-1] == 'LOD':
-                        # check for hightest LOD
-                        lodCounter = 0
-                        while (object.name[:-1]+str(lodCounter) in bpy.data.objects):
-                            lodCounter += 1
-                        # hide smaller LODS
-                        counter = 0
-                        while(counter < lodCounter-1):
-                            hideObject(
-                                bpy.data.objects[object.name[:-1] + str(counter)])
-                            counter += 1
+    timingLog: StringProperty(
+        name="Timing Log",
+        description=timing_log_description,
+        subtype='FILE_PATH',
+        default="",
+    )
 
-            # hide object if its a shadow or a collision
-            for object in bpy.data.objects:
-                if object.type == 'MESH':
-                    if len(object.material_slots) != 0:
-                        shader = object.material_slots[0].material.shaderList.shaderList
-                        if(shader == 'MeshCollision.fx' or shader == 'RSkinShadowVolume.fx' or shader == 'MeshShadowVolume.fx'):
-                            hideObject(object)
+    workers: IntProperty(
+        name="Worker Processes",
+        description="Number of processes parsing files, 0 uses one per processor",
+        default=0,
+        min=0,
+    )
 
-            # hide objects that are set to not visible
-            for object in bpy.data.objects:
-                if (object.type == 'MESH'):
-                    if object.Hidden == True:
-                        hideObject(object)
+    def draw(self, context):
+        layout = self.layout
 
-        def deleteRoot():
-            armature = utils.findArmature()
-            armature.select_set(True)  # select the skeleton
-            context.view_layer.objects.active = armature
-
-            if bpy.ops.object.mode != 'EDIT':
-                bpy.ops.object.mode_set(mode='EDIT')
-            if 'Root' in armature.data.edit_bones:
-                armature.data.edit_bones.remove(
-                    armature.data.edit_bones['Root'])
-            bpy.ops.object.mode_set(mode='OBJECT')
-
-        # material utility functions
-
-        def textureOverride(path, submod, texture_name):
-            submodEnd = path.find("\\Data")
-            submodStart = -1
-            if path.find(submod):
-                submodStart = path.find(submod)
-            if submodStart == -1:
-                submodStart = submodEnd + 1
-            newPath = path[:submodStart] + submod + path[submodEnd:]
-
-            if os.path.isfile(newPath):
-                return newPath
-            else:
-                self.report({"WARNING"}, f'ALAMO - {texture_name} not found in {submod}, falling back to default')
-                return path
-
-        def load_image(texture_name):
-            if texture_name == 'None':
-                return
-            elif (texture_name in bpy.data.images):
-                img = bpy.data.images[texture_name]
-            else:
-                path = file.name
-                path = os.path.split(path)[0]
-                path = os.path.split(path)[0]
-                for directory in os.listdir(path):
-                    if directory.upper() == 'TEXTURES':
-                        path = f'{path}/{directory}/{texture_name}'
-                        if self.properties.textureOverride != "NONE":
-                            path = textureOverride(path, self.properties.textureOverride, texture_name)
-                        if os.path.exists(path):
-                            img = bpy.data.images.load(path)
-                        else:
-                            with open(path, "a") as placeholder:
-                                placeholder.write('placeholder')
-                            img = bpy.data.images.load(path)
-                            os.remove(path)
-                            self.report({"WARNING"}, "ALAMO - Couldn't find texture: " + texture_name)
-                        return
-                self.report({"WARNING"}, "ALAMO - Couldn't find: " + path)
-
-        def validate_material_prop(name):
-            material_props = ["BaseTexture", "NormalTexture", "GlossTexture", "WaveTexture", "DistortionTexture", "CloudTexture", "CloudNormalTexture", "Emissive", "Diffuse", "Specular", "Shininess", "Colorization" \
-                , "DebugColor", "UVOffset", "Color", "UVScrollRate", "DiffuseColor", "EdgeBrightness", "BaseUVScale", "WaveUVScale", "DistortUVScale", "BaseUVScrollRate", "WaveUVScrollRate", "DistortUVScrollRate", "BendScale" \
-                , "Diffuse1", "CloudScrollRate", "CloudScale", "SFreq", "TFreq", "DistortionScale", "Atmosphere", "CityColor", "AtmospherePower", "SpecularTexture", "UVOffsetX", "UVOffsetY", "UVScaleFactor", "MaskTexture"]
-
-            if(name in material_props):
-                return True
-            self.report({"WARNING"}, "ALAMO - Unknown material porperty: " + name)
-            return False
+        layout.prop(self, "importAnimations")
+        layout.prop(self, "textureOverride")
+        layout.prop(self, "importMode")
+        layout.prop(self, "materialMode")
+        layout.prop(self, "reuseMeshes")
+        layout.prop(self, "workers")
+        layout.prop(self, "timingLog")
+
+    def file_paths(self):
+        names = [file.name for file in self.files if file.name.lower().endswith(".alo")]
+        if len(names) == 0 and os.path.isdir(self.directory):
+            names = sorted(name for name in listdir(self.directory) if name.lower().endswith(".alo"))
+        return [os.path.join(self.directory, name) for name in names]
 
-        def read_int(material):
-            file.seek(4, 1)  # skip size
-            name = read_string_mini_chunk()
-            file.seek(2, 1)  # skip mini header and size
-            value = struct.unpack('<I', file.read(4))[0]
-
-            if validate_material_prop(name):
-                exec('material.' + name + '= value')
-
-        def read_float(material):
-            file.seek(4, 1)  # skip size
-            name = read_string_mini_chunk()
-            file.seek(2, 1)  # skip mini header and size
-            value = struct.unpack('<f', file.read(4))[0]
-
-            if validate_material_prop(name):
-                exec('material.' + name + '= value')
-
-        def read_float3(material):
-            file.seek(4, 1)  # skip size
-            name = read_string_mini_chunk()
-            file.seek(2, 1)  # skip mini header and size
-            value1 = struct.unpack('<f', file.read(4))[0]
-            value2 = struct.unpack('<f', file.read(4))[0]
-            value3 = struct.unpack('<f', file.read(4))[0]
-
-            value = (value1, value2, value3)
-
-            if validate_material_prop(name):
-                exec('material.' + name + '= value')
-
-        def read_float4(material):
-            file.seek(4, 1)  # skip size
-            name = read_string_mini_chunk()
-            file.seek(2, 1)  # skip mini header and size
-            value1 = struct.unpack('<f', file.read(4))[0]
-            value2 = struct.unpack('<f', file.read(4))[0]
-            value3 = struct.unpack('<f', file.read(4))[0]
-            value4 = struct.unpack('<f', file.read(4))[0]
-
-            value = (value1, value2, value3, value4)
-
-            if validate_material_prop(name):
-                exec('material.' + name + '= value')
-
-        def loadAnimations(filePath):
-            # remove ending
-            path = os.path.dirname(filePath)
-            fileName = os.path.basename(filePath)[0:-4]
-            bpy.context.scene.modelFileName = fileName
-
-            animationFiles = []
-
-            for file in listdir(path):
-                fileExt = file[-4:]
-                if(fileExt.lower() == ".ala" and file[0:len(fileName)] == fileName):
-                    animationFiles.append(file)
-
-            importer = import_ala.AnimationImporter()
-            arm = utils.findArmature()
-            arm.animation_data_create()
-
-            for animFile in animationFiles:
-                importer.loadAnimation(os.path.join(path, animFile))
-
-        global assignedVertexGroups
-        assignedVertexGroups = []
-        global MeshNameList
-        MeshNameList = []
-        global doubleMeshes
-        doubleMeshes = []
-        global boneNameListALO
-        boneNameListALO = []
-        global boneConnectedDict
-        boneConnectedDict = {}
-
-        global meshList
-        meshList = []
-
-        global fileName
-        fileName = os.path.basename(self.properties.filepath)[0:-4]
-
-        global importCollection
-        importCollection = bpy.data.collections.new(fileName)
-        bpy.context.scene.collection.children.link(importCollection)
+    def execute(self, context):
+        paths = self.file_paths()
+        if len(paths) == 0:
+            self.report({"WARNING"}, 'ALAMO - No ALO files to import')
+            return {'CANCELLED'}
 
-        # is changed due to implementation details in the enum callback
         activeArmatureBackup = 'None'
         originalArmature = utils.findArmature()
         if(originalArmature != None):
             activeArmatureBackup = originalArmature.name
 
-        global file
-        filepath = self.properties.filepath
-        file = open(filepath, 'rb') #open file in read binary mode
-        process_active_junk()
-        removeShadowDoubles()
-        hideLODs()
-        deleteRoot()
-        if(self.importAnimations):
-            loadAnimations(filepath)
+        # forking blender isn't safe, workers are fresh interpreters that only import the reader
+        reader = standalone_reader()
+        workers = min(self.workers or os.cpu_count() or 1, len(paths))
+        imported = 0
+        readerDirectory = os.path.dirname(os.path.abspath(alo_reader.__file__))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=site.addsitedir, initargs=(readerDirectory,)) as executor:
+            # every process already keeps a core busy, the submeshes are decoded serially
+            futures = {executor.submit(reader.read_model, path, self.importMode, '', False, self.reuseMeshes): path
+                       for path in paths}
+            # blender data can only be created on the main thread, models are built as they arrive
+            for future in as_completed(futures):
+                try:
+                    model = future.result()
+                except Exception as error:
+                    self.report({"WARNING"}, f'ALAMO - Failed to read {futures[future]}: {error}')
+                    continue
+                # parsing happened in the workers, only the build phases are timed here
+                timer = PhaseTimer()
+                import_model(model, self.report, self.materialMode, self.textureOverride, self.importAnimations,
+                             reuseMeshes=self.reuseMeshes, timer=timer)
+                imported += 1
+                if self.timingLog != "":
+                    try:
+                        write_timing_log(self.timingLog, model.path, timer)
+                    except OSError as error:
+                        self.report({"WARNING"}, f'ALAMO - Could not write the timing log: {error}')
 
-        # restore previous active armature
         if(activeArmatureBackup != 'None'):
-            createdArmature = utils.findArmature()  # get new armature
-            bpy.context.scene.ActiveSkeleton.skeletonEnum = activeArmatureBackup  # restore
-            armature = utils.findArmature()
-            # set parent
-            if(self.parentName != 'None' and armature != None):
-                parentBone = armature.data.bones[self.parentName]
-                if(parentBone != None):
-                    createdArmature.parent = armature
-                    createdArmature.parent_bone = self.parentName
-                    createdArmature.parent_type = 'BONE'
-        for object in bpy.data.objects:
-            for constraint in object.constraints:
-                constraint.inverse_matrix = mathutils.Matrix.Identity(4)
-        return {'FINISHED'}            # this lets blender know the operator finished successfully.
+            bpy.context.scene.ActiveSkeleton.skeletonEnum = activeArmatureBackup
+        self.report({"INFO"}, f'ALAMO - Imported {imported} of {len(paths)} models')
+        return {'FINISHED'}
 
     def invoke(self, context, event):
         context.window_manager.fileselect_add(self)
         return {'RUNNING_MODAL'}
+
+
+class ALO_BuildMaterials(bpy.types.Operator):
+    """Load the textures and build the node trees of materials imported in deferred mode"""
+    bl_idname = "alamo.build_deferred_materials"
+    bl_label = "Build Deferred Materials"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        materials = set()
+        for object in context.selected_objects:
+            if object.type == 'MESH':
+                for slot in object.material_slots:
+                    if slot.material != None:
+                        materials.add(slot.material)
+        built = build_deferred_materials(materials, self.report)
+        self.report({"INFO"}, f'ALAMO - Built {built} materials')
+        return {'FINISHED'}
+
+
+class ALO_LoadTextures(bpy.types.Operator):
+    """Read the textures used by the materials of the selected objects from disk"""
+    bl_idname = "alamo.load_textures"
+    bl_label = "Load Textures"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        images = set()
+        for object in context.selected_objects:
+            if object.type == 'MESH':
+                for slot in object.material_slots:
+                    if slot.material == None:
+                        continue
+                    for prop in material_props:
+                        if prop.endswith('Texture') and prop in slot.material:
+                            image = bpy.data.images.get(slot.material[prop])
+                            if image != None:
+                                images.add(image)
+        load_textures(images)
+        self.report({"INFO"}, f'ALAMO - Loaded {len(images)} textures')
+        return {'FINISHED'}
@@ -0,0 +1,251 @@
+"""On-disk cache of parsed ALO models.
+
+Entries are numpy .npz archives holding the arrays of a Model next to its
+metadata as JSON, no pickles are involved. An index file maps model paths
+to their entries, an entry is valid while the size and modification time
+of the model match, a touched file with unchanged content is recognised by
+its hash. Entries are evicted least recently used first once the cache
+grows over its size limit.
+"""
+import json
+import os
+import tempfile
+import time
+import zipfile
+import numpy as np
+
+from . import alo_reader
+
+default_directory = os.path.join(tempfile.gettempdir(), "alamo_model_cache")
+default_size_limit = 1024 * 1024 * 1024
+
+# bumped whenever the layout of the cached models changes, older entries are ignored
+cache_version = 1
+
+
+def model_to_arrays(model):
+    # splits a Model into json metadata and a dict of named arrays
+    arrays = {}
+    metadata = {
+        'version': cache_version,
+        'skeleton': None,
+        'objects': [],
+        'lightCount': model.lightCount,
+        'connections': [[connection.objectIndex, connection.boneIndex] for connection in model.connections],
+        'proxies': [[proxy.name, proxy.boneIndex, proxy.isHidden, proxy.altDecreaseStayHidden]
+                    for proxy in model.proxies],
+    }
+    skeleton = model.skeleton
+    if skeleton is not None:
+        metadata['skeleton'] = skeleton.names
+        arrays['skeleton_parents'] = skeleton.parents
+        arrays['skeleton_visible'] = skeleton.visible
+        arrays['skeleton_billboard'] = skeleton.billboard
+        arrays['skeleton_matrices'] = skeleton.matrices
+    for meshIndex, mesh in enumerate(model.objects):
+        if mesh is None:
+            metadata['objects'].append(None)
+            continue
+        materials = []
+        for subMeshIndex, subMesh in enumerate(mesh.subMeshes):
+            material = subMesh.material
+            materials.append([material.shader, material.params, material.textures])
+            prefix = f'mesh{meshIndex}_{subMeshIndex}_'
+            arrays[prefix + 'vertices'] = subMesh.vertices
+            arrays[prefix + 'UVs'] = subMesh.UVs
+            arrays[prefix + 'boneIndex'] = subMesh.boneIndex
+            arrays[prefix + 'faces'] = subMesh.faces
+            arrays[prefix + 'animationMapping'] = subMesh.animationMapping
+        metadata['objects'].append([mesh.name, mesh.isHidden, mesh.collision, materials])
+    return metadata, arrays
+
+
+def model_from_arrays(path, metadata, arrays):
+    model = alo_reader.Model(path)
+    if metadata['skeleton'] is not None:
+        model.skeleton = alo_reader.Skeleton(
+            metadata['skeleton'],
+            arrays['skeleton_parents'],
+            arrays['skeleton_visible'],
+            arrays['skeleton_billboard'],
+            arrays['skeleton_matrices'],
+        )
+    for meshIndex, entry in enumerate(metadata['objects']):
+        if entry is None:
+            model.objects.append(None)
+            continue
+        name, isHidden, collision, materials = entry
+        subMeshes = []
+        for subMeshIndex, (shader, params, textures) in enumerate(materials):
+            # json turns the float vectors into lists, the material keys expect the tuples of the reader
+            params = [(paramName, tuple(value) if isinstance(value, list) else value) for paramName, value in params]
+            material = alo_reader.Material(shader, params, [tuple(texture) for texture in textures])
+            prefix = f'mesh{meshIndex}_{subMeshIndex}_'
+            subMeshes.append(alo_reader.SubMesh(
+                material,
+                arrays[prefix + 'vertices'],
+                arrays[prefix + 'UVs'],
+                arrays[prefix + 'boneIndex'],
+                arrays[prefix + 'faces'],
+                arrays[prefix + 'animationMapping'],
+            ))
+        model.objects.append(alo_reader.Mesh(name, isHidden, collision, subMeshes))
+    model.lightCount = metadata['lightCount']
+    model.connections = [alo_reader.Connection(*connection) for connection in metadata['connections']]
+    model.proxies = [alo_reader.Proxy(*proxy) for proxy in metadata['proxies']]
+    return model
+
+
+def select_model_meshes(model, mode='ALL', meshNames=''):
+    # drops the meshes an import mode skips from a complete model, like ALOReader.read does
+    if mode == 'ALL':
+        return model
+    meshIndices = [index for index, mesh in enumerate(model.objects) if mesh is not None]
+    selected = alo_reader.select_meshes([model.objects[index].name for index in meshIndices], mode, meshNames)
+    for meshIndex, objectIndex in enumerate(meshIndices):
+        if meshIndex not in selected:
+            model.objects[objectIndex] = None
+    return model
+
+
+class ModelCache():
+    def __init__(self, directory=default_directory, sizeLimit=default_size_limit):
+        self.directory = directory
+        self.sizeLimit = sizeLimit
+        self.indexPath = os.path.join(directory, "index.json")
+        self.index = self.load_index()
+
+    def load_index(self):
+        try:
+            with open(self.indexPath, 'r') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict):
+            return {}
+        return index
+
+    def save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        temporaryPath = self.indexPath + ".tmp"
+        with open(temporaryPath, 'w') as file:
+            json.dump(self.index, file)
+        os.replace(temporaryPath, self.indexPath)
+
+    def entry_path(self, entry):
+        return os.path.join(self.directory, entry['file'])
+
+    def lookup(self, path):
+        # returns the index entry of an up to date model, None if the model has to be parsed
+        key = os.path.abspath(path)
+        entry = self.index.get(key)
+        if entry is None or entry.get('version') != cache_version:
+            return None
+        if not os.path.isfile(self.entry_path(entry)):
+            del self.index[key]
+            return None
+        stat = os.stat(path)
+        if stat.st_size != entry['size']:
+            return None
+        if stat.st_mtime_ns != entry['mtime']:
+            # touched or copied, the entry is still valid if the content didn't change
+            if alo_reader.file_hash(path) != entry['hash']:
+                return None
+            entry['mtime'] = stat.st_mtime_ns
+        return entry
+
+    def load(self, path):
+        entry = self.lookup(path)
+        if entry is None:
+            return None
+        try:
+            with np.load(self.entry_path(entry), allow_pickle=False) as archive:
+                metadata = json.loads(str(archive['metadata']))
+                arrays = {name: archive[name] for name in archive.files if name != 'metadata'}
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            # a damaged entry is dropped, the model is parsed and stored again
+            self.remove(os.path.abspath(path))
+            return None
+        entry['used'] = time.time()
+        self.save_index()
+        model = model_from_arrays(path, metadata, arrays)
+        model.contentHash = entry['hash']
+        return model
+
+    def store(self, path, model):
+        key = os.path.abspath(path)
+        stat = os.stat(path)
+        contentHash = model.contentHash or alo_reader.file_hash(path)
+        metadata, arrays = model_to_arrays(model)
+        fileName = contentHash + ".npz"
+        os.makedirs(self.directory, exist_ok=True)
+        entryPath = os.path.join(self.directory, fileName)
+        # identical models share the entry file, it is replaced in one step like the index
+        temporaryPath = f"{entryPath}.{os.getpid()}.tmp"
+        with open(temporaryPath, 'wb') as file:
+            np.savez(file, metadata=np.array(json.dumps(metadata)), **arrays)
+        os.replace(temporaryPath, entryPath)
+
+        self.remove(key, keepFile=fileName)
+        self.index[key] = {
+            'version': cache_version,
+            'file': fileName,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': contentHash,
+            'bytes': os.path.getsize(entryPath),
+            'used': time.time(),
+        }
+        self.evict()
+        self.save_index()
+
+    def remove(self, key, keepFile=None):
+        entry = self.index.pop(key, None)
+        if entry is None or entry['file'] == keepFile:
+            return
+        # identical files at different paths share their entry file
+        if any(other['file'] == entry['file'] for other in self.index.values()):
+            return
+        try:
+            os.remove(self.entry_path(entry))
+        except OSError:
+            pass
+
+    def evict(self):
+        files = {}
+        for entry in self.index.values():
+            files[entry['file']] = entry['bytes']
+        total = sum(files.values())
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]['used']):
+            if total <= self.sizeLimit:
+                break
+            sharedFile = sum(1 for other in self.index.values() if other['file'] == entry['file']) > 1
+            self.remove(key)
+            if not sharedFile:
+                total -= entry['bytes']
+
+    def clear(self):
+        for key in list(self.index):
+            self.remove(key)
+        self.save_index()
+
+
+def read_model(path, mode='ALL', meshNames='', cache=None, hashContent=False):
+    """Read a model through the cache.
+
+    Only complete models are cached, they serve every import mode. A partial import that misses the
+    cache only decodes its meshes and stores nothing.
+    """
+    if cache is None:
+        return alo_reader.read_model(path, mode, meshNames, hashContent=hashContent)
+    model = cache.load(path)
+    if model is not None:
+        return select_model_meshes(model, mode, meshNames)
+    # stored models are named by their hash
+    model = alo_reader.read_model(path, mode, meshNames, hashContent=hashContent or mode == 'ALL')
+    if mode == 'ALL':
+        try:
+            cache.store(path, model)
+        except OSError:
+            pass  # a full or read only cache directory shouldn't stop the import
+    return model
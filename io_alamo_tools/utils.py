@@ -1,6 +1,7 @@
 import bpy
 import struct
 import mathutils
+from . import alo_reader
 
 #utilities
 def findArmature():
@@ -74,6 +75,9 @@ def read_float(float):
 def read_int(int):
     return struct.unpack("<I", int)[0]
 
+# shared with the bpy-free ALO reader
+read_string = alo_reader.read_string
+
 def even(n):
     if n % 2 == 0:
         return True